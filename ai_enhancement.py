@@ -1,13 +1,121 @@
 import re
 import json
-from typing import List, Dict, Any
-from collections import defaultdict
+import hashlib
+import mmap
+from bisect import bisect_right
+from dataclasses import dataclass, asdict
+from enum import IntEnum
+from typing import List, Dict, Any, Optional, Callable
+from collections import defaultdict, Counter, OrderedDict
+
+# Prefer google-re2 (linear-time matching, no catastrophic backtracking) when
+# it is installed; the stdlib engine is used otherwise.
+try:
+    import re2 as _re
+    HAVE_RE2 = True
+except ImportError:
+    _re = re
+    HAVE_RE2 = False
+
+# numpy vectorizes the per-line metrics when importable. It is optional: not
+# a dependency of this app (it only arrives with pandas/matplotlib), and the
+# pure-Python loop gives identical results without it.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# pyahocorasick counts all decision keywords in one automaton pass; optional
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Hyperscan gives SIMD multi-pattern matching for batch scans; optional as well
+try:
+    import hyperscan
+    HAVE_HYPERSCAN = True
+except ImportError:
+    hyperscan = None
+    HAVE_HYPERSCAN = False
+
+# Complexity metric patterns, compiled once at import time
+FUNCTION_DEF_RE = _re.compile(r'def\s+\w+')
+CLASS_DEF_RE = _re.compile(r'class\s+\w+')
+# Context words that raise a finding's severity; case-insensitive search
+# avoids lowercasing a copy of every match
+USER_INPUT_RE = re.compile(r'user|input', re.IGNORECASE)
+PRIVILEGED_RE = re.compile(r'admin|root', re.IGNORECASE)
+
+# Any byte outside ASCII; mmap has no isascii()
+NON_ASCII_RE = re.compile(rb'[\x80-\xff]')
+
+DECISION_KEYWORDS = ('if', 'elif', 'while', 'for', 'except', 'and', 'or')
+DECISION_RE = _re.compile(r'\b(?:' + '|'.join(DECISION_KEYWORDS) + r')\b')
+
+if ahocorasick is not None:
+    DECISION_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in DECISION_KEYWORDS:
+        DECISION_AUTOMATON.add_word(_keyword, len(_keyword))
+    DECISION_AUTOMATON.make_automaton()
+else:
+    DECISION_AUTOMATON = None
+
+def newline_offsets(text):
+    """Return the offsets of every newline in text (str, bytes or mmap), in order"""
+    newline = '\n' if isinstance(text, str) else b'\n'
+    offsets = []
+    pos = text.find(newline)
+    while pos != -1:
+        offsets.append(pos)
+        pos = text.find(newline, pos + 1)
+    return offsets
+
+class VulnType(IntEnum):
+    """Vulnerability categories; values index the per-type score tables"""
+    SQL_INJECTION = 0
+    XSS = 1
+    HARDCODED_SECRETS = 2
+    BUFFER_OVERFLOW = 3
+    RACE_CONDITION = 4
+    
+    @property
+    def label(self) -> str:
+        """Name used in findings, e.g. 'sql_injection'"""
+        return self.name.lower()
+
+# Per-type scores indexed by VulnType, so the scan loop does no string hashing
+SEVERITY_WEIGHTS = (0.9, 0.8, 0.85, 0.95, 0.7)
+CONFIDENCE_SCORES = (0.8, 0.75, 0.9, 0.85, 0.6)
+VULN_TYPES_BY_LABEL = {vuln_type.label: vuln_type for vuln_type in VulnType}
+
+@dataclass(frozen=True, slots=True)
+class Finding:
+    """A single predicted vulnerability"""
+    type: str
+    line: int
+    severity: float
+    confidence: float
+    suggestion: str
+    match: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the finding as a plain dict, e.g. for JSON export"""
+        return asdict(self)
+
+def _is_word_char(ch: str) -> bool:
+    """Match the str semantics of \\w in the re module"""
+    return ch.isalnum() or ch == '_'
 
 class AIBugPredictor:
     """AI-powered bug prediction and enhancement features"""
     
+    # Number of (kind, content hash) results kept by the scan cache
+    CACHE_SIZE = 512
+    
     def __init__(self):
-        self.vulnerability_patterns = {
+        self._cache = OrderedDict()
+        raw_patterns = {
             'sql_injection': [
                 r'execute\s*\(\s*["\'].*%.*["\']',
                 r'query\s*\(\s*["\'].*\+.*["\']',
@@ -35,43 +143,194 @@ class AIBugPredictor:
             ]
         }
         
+        # Compile every pattern once so scans don't hit the re cache per call
+        self.vulnerability_patterns = {
+            vuln_type: [_re.compile('(?im)' + p) for p in patterns]
+            for vuln_type, patterns in raw_patterns.items()
+        }
+        # VulnType of each pattern, in the order they were compiled, so a
+        # Hyperscan id maps straight to its type
+        self._pattern_types = [
+            VULN_TYPES_BY_LABEL[vuln_type]
+            for vuln_type, patterns in raw_patterns.items()
+            for _ in patterns
+        ]
+        # (VulnType, regex) pairs in that order, for str and for bytes input.
+        # One finditer per pattern beat a fused lookahead alternation.
+        self._str_patterns = list(zip(
+            self._pattern_types,
+            (compiled for patterns in self.vulnerability_patterns.values() for compiled in patterns)
+        ))
+        self._bytes_patterns = list(zip(
+            self._pattern_types,
+            (_re.compile(b'(?im)' + p.encode('ascii'))
+             for patterns in raw_patterns.values() for p in patterns)
+        ))
+        self._hs_db = self._build_hyperscan_db(raw_patterns)
+        
         self.severity_weights = {
-            'sql_injection': 0.9,
-            'xss': 0.8,
-            'hardcoded_secrets': 0.85,
-            'buffer_overflow': 0.95,
-            'race_condition': 0.7
+            vuln_type.label: SEVERITY_WEIGHTS[vuln_type] for vuln_type in VulnType
         }
     
-    def predict_vulnerabilities(self, code: str, language: str) -> List[Dict[str, Any]]:
+    def _build_hyperscan_db(self, raw_patterns: Dict[str, List[str]]) -> Optional[Any]:
+        """Compile all patterns into a Hyperscan block-mode database"""
+        if not HAVE_HYPERSCAN:
+            return None
+        
+        expressions = [p.encode() for patterns in raw_patterns.values() for p in patterns]
+        # UTF8/UCP make quantifiers and classes work on characters, like the
+        # str regexes; scanned buffers are always valid UTF-8 from encode()
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE
+                 | hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[flags] * len(expressions)
+            )
+            return db
+        except hyperscan.error as e:
+            print(f"Hyperscan compile failed, using regex scanning: {e}")
+            return None
+    
+    def _make_prediction(self, vuln_type: VulnType, line_num: int, matched: str) -> Finding:
+        """Build a prediction record for a single pattern hit"""
+        return Finding(
+            type=vuln_type.label,
+            line=line_num,
+            severity=self._adjust_severity(SEVERITY_WEIGHTS[vuln_type], matched),
+            confidence=CONFIDENCE_SCORES[vuln_type],
+            suggestion=self.get_fix_suggestion(vuln_type.label),
+            match=matched
+        )
+    
+    def _cached(self, kind: str, code, compute: Callable[[Any], Any]) -> Any:
+        """Return compute(code), reusing the result for identical content
+        
+        code may be a str or any bytes-like buffer (e.g. an mmap).
+        """
+        data = code.encode('utf-8', 'surrogatepass') if isinstance(code, str) else code
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        key = (kind, digest)
+        
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        
+        result = compute(code)
+        self._cache[key] = result
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+    
+    def predict_vulnerabilities(self, code: str, language: str) -> List[Finding]:
         """Predict potential vulnerabilities using pattern matching"""
+        # Findings are immutable, so only the list needs copying
+        return list(self._cached('predict', code, self._predict_with_regex))
+    
+    def _predict_with_regex(self, code: str) -> List[Finding]:
+        """Scan one source with each compiled pattern"""
+        return self._scan_with_patterns(code, self._str_patterns)
+    
+    def _scan_with_patterns(self, buf, patterns) -> List[Finding]:
+        """Run each (VulnType, regex) pair over buf, in order"""
         predictions = []
+        newlines = None
         
-        for vuln_type, patterns in self.vulnerability_patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, code, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    line_num = code[:match.start()].count('\n') + 1
-                    predictions.append({
-                        'type': vuln_type,
-                        'line': line_num,
-                        'severity': self.calculate_severity(vuln_type, match.group()),
-                        'confidence': self.calculate_confidence(vuln_type, match.group()),
-                        'suggestion': self.get_fix_suggestion(vuln_type),
-                        'match': match.group()
-                    })
+        for vuln_type, pattern in patterns:
+            for match in pattern.finditer(buf):
+                # Index newlines once on the first hit; each lookup is then a bisect
+                if newlines is None:
+                    newlines = newline_offsets(buf)
+                line_num = bisect_right(newlines, match.start()) + 1
+                matched = match.group()
+                if isinstance(matched, bytes):
+                    matched = matched.decode('utf-8', 'replace')
+                predictions.append(self._make_prediction(vuln_type, line_num, matched))
+        
+        return predictions
+    
+    def predict_vulnerabilities_from_path(self, path: str, language: str) -> List[Finding]:
+        """Predict vulnerabilities in a file by scanning its bytes in place
+        
+        The file is memory-mapped and matched with the bytes form of each
+        pattern, so it is never read into memory or decoded as a whole.
+        Bytes patterns count bytes, not characters, so files with any
+        non-ASCII byte are decoded and scanned as text instead.
+        """
+        with open(path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return []
+            with mm:
+                if NON_ASCII_RE.search(mm):
+                    return self.predict_vulnerabilities(mm[:].decode('utf-8', 'replace'), language)
+                return list(self._cached('predict_bytes', mm, self._predict_bytes_with_regex))
+    
+    def _predict_bytes_with_regex(self, buf) -> List[Finding]:
+        """Scan a bytes-like buffer with the bytes form of each pattern"""
+        return self._scan_with_patterns(buf, self._bytes_patterns)
+    
+    def predict_vulnerabilities_batch(self, codes: List[str], language: str) -> List[List[Finding]]:
+        """Predict vulnerabilities for many sources, one result list per source"""
+        if self._hs_db is None:
+            return [self.predict_vulnerabilities(code, language) for code in codes]
+        
+        return [
+            # Own cache key: Hyperscan's match semantics can differ from re's,
+            # so a result must not depend on which path saw the source first
+            list(self._cached('predict_hs', code, self._predict_with_hyperscan))
+            for code in codes
+        ]
+    
+    def _predict_with_hyperscan(self, code: str) -> List[Finding]:
+        """Scan one source with the Hyperscan database"""
+        buf = code.encode('utf-8', 'replace')
+        spans = {}
+        
+        def on_match(pattern_id, start, end, flags, context):
+            # Hyperscan reports every end offset; keep the longest match per
+            # start, which is what the greedy regex would have returned.
+            key = (pattern_id, start)
+            if end > spans.get(key, -1):
+                spans[key] = end
+        
+        self._hs_db.scan(buf, match_event_handler=on_match)
+        
+        newlines = newline_offsets(buf)
+        predictions = []
+        last_end = {}
+        
+        # Grouped by pattern, then position, like the regex path
+        for (pattern_id, start), end in sorted(spans.items()):
+            # Drop hits nested inside an earlier match of the same pattern
+            if start < last_end.get(pattern_id, -1):
+                continue
+            last_end[pattern_id] = end
+            
+            vuln_type = self._pattern_types[pattern_id]
+            line_num = bisect_right(newlines, start) + 1
+            matched = buf[start:end].decode('utf-8', 'replace')
+            predictions.append(self._make_prediction(vuln_type, line_num, matched))
         
         return predictions
     
     def calculate_severity(self, vuln_type: str, match: str) -> float:
         """Calculate severity score for a vulnerability"""
-        base_severity = self.severity_weights.get(vuln_type, 0.5)
-        
+        return self._adjust_severity(self.severity_weights.get(vuln_type, 0.5), match)
+    
+    def _adjust_severity(self, base_severity: float, match: str) -> float:
+        """Raise a base severity for matches that mention users or privileges"""
         # Adjust based on context
-        if 'user' in match.lower() or 'input' in match.lower():
+        if USER_INPUT_RE.search(match):
             base_severity += 0.1
         
-        if 'admin' in match.lower() or 'root' in match.lower():
+        if PRIVILEGED_RE.search(match):
             base_severity += 0.15
         
         return min(base_severity, 1.0)
@@ -79,15 +338,11 @@ class AIBugPredictor:
     def calculate_confidence(self, vuln_type: str, match: str) -> float:
         """Calculate confidence score for a prediction"""
         # Simple confidence calculation based on pattern specificity
-        confidence_map = {
-            'sql_injection': 0.8,
-            'xss': 0.75,
-            'hardcoded_secrets': 0.9,
-            'buffer_overflow': 0.85,
-            'race_condition': 0.6
-        }
+        known_type = VULN_TYPES_BY_LABEL.get(vuln_type)
+        if known_type is None:
+            return 0.5
         
-        return confidence_map.get(vuln_type, 0.5)
+        return CONFIDENCE_SCORES[known_type]
     
     def get_fix_suggestion(self, vuln_type: str) -> str:
         """Get fix suggestions for vulnerability types"""
@@ -103,53 +358,117 @@ class AIBugPredictor:
     
     def analyze_code_complexity(self, code: str) -> Dict[str, Any]:
         """Analyze code complexity metrics"""
-        lines = code.split('\n')
+        return dict(self._cached('complexity', code, self._compute_complexity))
+    
+    def _compute_complexity(self, code: str) -> Dict[str, Any]:
+        """Compute the metrics returned by analyze_code_complexity"""
+        total_lines, code_lines, comment_lines, max_depth = self._select_line_metrics(code)
         
         metrics = {
-            'total_lines': len(lines),
-            'code_lines': len([line for line in lines if line.strip() and not line.strip().startswith('#')]),
-            'comment_lines': len([line for line in lines if line.strip().startswith('#')]),
+            'total_lines': total_lines,
+            'code_lines': code_lines,
+            'comment_lines': comment_lines,
             'cyclomatic_complexity': self.calculate_cyclomatic_complexity(code),
-            'nesting_depth': self.calculate_max_nesting_depth(code),
-            'function_count': len(re.findall(r'def\s+\w+', code)),
-            'class_count': len(re.findall(r'class\s+\w+', code))
+            'nesting_depth': max_depth,
+            'function_count': len(FUNCTION_DEF_RE.findall(code)),
+            'class_count': len(CLASS_DEF_RE.findall(code))
         }
         
         return metrics
     
+    def _select_line_metrics(self, code: str):
+        """Run the vectorized line metrics when possible, else the Python loop"""
+        if np is not None and code.isascii():
+            return self._line_metrics_vectorized(code)
+        return self._line_metrics(code)
+    
+    def _line_metrics(self, code: str):
+        """Count total/code/comment lines and max nesting depth in one pass"""
+        total_lines = 0
+        code_lines = 0
+        comment_lines = 0
+        max_depth = 0
+        
+        # One walk over the lines collects line counts and nesting depth
+        for line in code.split('\n'):
+            total_lines += 1
+            stripped = line.lstrip()
+            if not stripped:
+                continue
+            if stripped[0] == '#':
+                comment_lines += 1
+            else:
+                code_lines += 1
+                indent_level = (len(line) - len(stripped)) // 4
+                if indent_level > max_depth:
+                    max_depth = indent_level
+        
+        return total_lines, code_lines, comment_lines, max_depth
+    
+    def _line_metrics_vectorized(self, code: str):
+        """Same as _line_metrics, computed with numpy over the ASCII byte buffer"""
+        buf = np.frombuffer(code.encode('ascii'), dtype=np.uint8)
+        newlines = np.flatnonzero(buf == 0x0A)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.append(newlines, len(buf))
+        
+        # ASCII whitespace per str.isspace(): space, \t-\r and \x1c-\x1f
+        # (the unsigned subtractions wrap, turning each range into one compare)
+        blank = (buf == 0x20) | (buf - np.uint8(0x09) <= 4) | (buf - np.uint8(0x1C) <= 3)
+        
+        # A line's first non-whitespace byte always follows whitespace, a newline
+        # or the start of the buffer, so only those positions are indexed. The
+        # trailing sentinel keeps every lookup in range and never lands in a line.
+        word_start = ~blank
+        word_start[1:] &= blank[:-1]
+        content = np.append(np.flatnonzero(word_start), len(buf))
+        first = content[np.searchsorted(content, starts)]
+        has_content = first < ends
+        
+        is_comment = np.zeros(len(starts), dtype=bool)
+        is_comment[has_content] = buf[first[has_content]] == 0x23
+        is_code = has_content & ~is_comment
+        
+        depths = (first[is_code] - starts[is_code]) // 4
+        max_depth = int(depths.max()) if len(depths) else 0
+        
+        return len(starts), int(is_code.sum()), int(is_comment.sum()), max_depth
+    
     def calculate_cyclomatic_complexity(self, code: str) -> int:
         """Calculate cyclomatic complexity"""
-        # Count decision points
-        decision_keywords = ['if', 'elif', 'while', 'for', 'except', 'and', 'or']
-        complexity = 1  # Base complexity
+        # Count decision points in a single scan, plus the base complexity
+        if DECISION_AUTOMATON is None:
+            return 1 + len(DECISION_RE.findall(code))
         
-        for keyword in decision_keywords:
-            complexity += len(re.findall(rf'\b{keyword}\b', code))
+        # The automaton also reports keywords inside identifiers ("or" in
+        # "format"), so only hits bounded by non-word characters count
+        complexity = 1
+        last = len(code) - 1
+        for end, length in DECISION_AUTOMATON.iter(code):
+            start = end - length + 1
+            if start > 0 and _is_word_char(code[start - 1]):
+                continue
+            if end < last and _is_word_char(code[end + 1]):
+                continue
+            complexity += 1
         
         return complexity
     
     def calculate_max_nesting_depth(self, code: str) -> int:
         """Calculate maximum nesting depth"""
-        lines = code.split('\n')
-        max_depth = 0
-        current_depth = 0
-        
-        for line in lines:
-            stripped = line.lstrip()
-            if stripped and not stripped.startswith('#'):
-                # Calculate indentation level
-                indent_level = (len(line) - len(stripped)) // 4
-                max_depth = max(max_depth, indent_level)
-        
-        return max_depth
+        # Shares the line-metrics pass; the numpy path finds each line's indent
+        # without allocating a stripped copy of the line
+        return self._select_line_metrics(code)[3]
     
-    def generate_risk_score(self, semgrep_results: List[Dict], ai_predictions: List[Dict]) -> float:
+    def generate_risk_score(self, semgrep_results: List[Dict], ai_predictions: List[Finding]) -> float:
         """Generate overall risk score"""
-        semgrep_score = len([r for r in semgrep_results if r.get('extra', {}).get('severity') == 'ERROR']) * 0.3
-        semgrep_score += len([r for r in semgrep_results if r.get('extra', {}).get('severity') == 'WARNING']) * 0.2
-        semgrep_score += len([r for r in semgrep_results if r.get('extra', {}).get('severity') == 'INFO']) * 0.1
+        # Tally severities in one pass instead of three filtered copies
+        severity_counts = Counter(r.get('extra', {}).get('severity') for r in semgrep_results)
+        semgrep_score = severity_counts['ERROR'] * 0.3
+        semgrep_score += severity_counts['WARNING'] * 0.2
+        semgrep_score += severity_counts['INFO'] * 0.1
         
-        ai_score = sum([p['severity'] * p['confidence'] for p in ai_predictions])
+        ai_score = sum(p.severity * p.confidence for p in ai_predictions)
         
         total_score = (semgrep_score + ai_score) / 10  # Normalize to 0-1 scale
         return min(total_score, 1.0)
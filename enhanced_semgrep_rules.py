@@ -1,9 +1,35 @@
+import atexit
 import json
 import os
 import tempfile
 
+# orjson parses bytes directly with a C parser; stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def parse_json_bytes(data):
+    """Parse JSON from raw subprocess output bytes"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Invalid UTF-8 in the output; retry with lenient decoding below
+            pass
+    return json.loads(data.decode('utf-8', errors='replace'))
+
+def path_key(path):
+    """Normalize a path for matching Semgrep's reported paths to requested ones
+    
+    Semgrep rewrites the paths it reports (./a.py comes back as a.py, doubled
+    separators collapse), so both sides are compared in absolute normal form.
+    """
+    return os.path.normpath(os.path.abspath(path))
+
 class EnhancedSemgrepAnalyzer:
     def __init__(self):
+        self._rules_path = None
         self.custom_rules = {
             "sql_injection": {
                 "id": "sql-injection-detection",
@@ -85,18 +111,62 @@ class EnhancedSemgrepAnalyzer:
         # Create temporary file
         temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False)
         
-        # Convert to YAML format
+        # Convert to YAML format (libyaml-backed dumper when available)
         import yaml
-        yaml.dump(rules_content, temp_file, default_flow_style=False)
+        dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+        yaml.dump(rules_content, temp_file, Dumper=dumper, default_flow_style=False)
         temp_file.close()
         
         return temp_file.name
     
+    def _ensure_rules_file(self):
+        """Write the rules file on first use and reuse it for the process lifetime"""
+        if self._rules_path is None or not os.path.exists(self._rules_path):
+            self._rules_path = self.create_custom_rules_file()
+            atexit.register(self._remove_rules_file, self._rules_path)
+        return self._rules_path
+    
+    @staticmethod
+    def _remove_rules_file(path):
+        """Delete a rules file written by _ensure_rules_file"""
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    
     def analyze_with_custom_rules(self, file_path):
         """Run Semgrep with custom rules"""
+        # One target, so every reported finding belongs to it whatever path
+        # Semgrep printed
+        return self._run_custom_rules([file_path])
+    
+    def analyze_files_with_custom_rules(self, file_paths):
+        """Run Semgrep with custom rules over many files in one process
+        
+        Returns a dict mapping each path to its list of findings.
+        """
+        file_paths = list(file_paths)
+        findings_by_path = {path: [] for path in file_paths}
+        if not file_paths:
+            return findings_by_path
+        
+        # Reported paths are matched back to every requested spelling of them
+        requested = {}
+        for path in file_paths:
+            requested.setdefault(path_key(path), []).append(path)
+        for finding in self._run_custom_rules(file_paths):
+            for path in requested.get(path_key(finding.get('path', '')), ()):
+                findings_by_path[path].append(finding)
+        return findings_by_path
+    
+    def _run_custom_rules(self, file_paths):
+        """Run one Semgrep process with the custom rules over file_paths
+        
+        Returns the raw findings, or [] when Semgrep fails.
+        """
         import subprocess
         
-        rules_file = self.create_custom_rules_file()
+        rules_file = self._ensure_rules_file()
         
         try:
             cmd = [
@@ -104,37 +174,30 @@ class EnhancedSemgrepAnalyzer:
                 '--config', rules_file,
                 '--json',
                 '--quiet',
-                file_path
+                '--jobs', str(os.cpu_count() or 1),
+                *file_paths
             ]
             
+            # Capture raw bytes; the JSON parser decodes them itself
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=30
+                timeout=30 * len(file_paths)
             )
             
             if result.returncode == 0:
                 try:
-                    findings = json.loads(result.stdout)
+                    findings = parse_json_bytes(result.stdout)
                     return findings.get('results', [])
                 except json.JSONDecodeError:
                     return []
             else:
-                print(f"Semgrep error: {result.stderr}")
+                print(f"Semgrep error: {result.stderr.decode('utf-8', errors='replace')}")
                 return []
                 
         except Exception as e:
             print(f"Error running custom analysis: {e}")
             return []
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(rules_file)
-            except:
-                pass
     
     def get_vulnerability_details(self, rule_id):
         """Get detailed information about a vulnerability"""
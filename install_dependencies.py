@@ -1,6 +1,14 @@
+import shutil
 import subprocess
 import sys
 
+def get_install_command():
+    """Return the package install command, preferring uv when it is on PATH"""
+    if shutil.which('uv'):
+        # uv's resolver is much faster than pip's; target this interpreter
+        return ['uv', 'pip', 'install', '--python', sys.executable]
+    return [sys.executable, '-m', 'pip', 'install', '--prefer-binary', '--no-input']
+
 def install_requirements():
     """Install required dependencies"""
     requirements = [
@@ -10,13 +18,24 @@ def install_requirements():
         'seaborn>=0.11.0'
     ]
     
-    for requirement in requirements:
-        try:
-            print(f"Installing {requirement}...")
-            subprocess.check_call([sys.executable, '-m', 'pip', 'install', requirement])
+    pip_cmd = get_install_command()
+    
+    # Resolve and install everything in a single pip run
+    try:
+        print(f"Installing {', '.join(requirements)}...")
+        subprocess.check_call([*pip_cmd, *requirements])
+        for requirement in requirements:
             print(f"✓ {requirement} installed successfully")
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Failed to install {requirement}: {e}")
+    except subprocess.CalledProcessError:
+        # Fall back to one package at a time to pinpoint the failure
+        print("Batch install failed, retrying packages individually...")
+        for requirement in requirements:
+            try:
+                print(f"Installing {requirement}...")
+                subprocess.check_call([*pip_cmd, requirement])
+                print(f"✓ {requirement} installed successfully")
+            except subprocess.CalledProcessError as e:
+                print(f"✗ Failed to install {requirement}: {e}")
     
     print("\nInstallation complete! You can now run the application with: python main.py")
 
@@ -1,15 +1,223 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, scrolledtext
 import subprocess
 import json
+import codecs
+import hashlib
+import heapq
+import io
 import os
+import queue
 import tempfile
 import threading
+import time
 import sqlite3
+import zlib
+from bisect import bisect_right
+from collections import Counter, deque
+from itertools import islice
 from datetime import datetime
 import re
 from pathlib import Path
 
+from enhanced_semgrep_rules import parse_json_bytes, path_key
+
+# ijson parses semgrep's JSON incrementally; without it stdout is read whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Hyperscan matches every built-in pattern in one linear-time pass; optional too
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Severity ordering shared by the built-in levels and semgrep's INFO/WARNING/ERROR
+SEVERITY_RANKS = {'INFO': 0, 'LOW': 1, 'MEDIUM': 2, 'WARNING': 2, 'HIGH': 3, 'ERROR': 3, 'CRITICAL': 4}
+# Results text tag for each severity rank
+SEVERITY_TAGS = ('info', 'low', 'medium', 'high', 'critical')
+
+# Statements queued for the database writer thread
+_INSERT_SQL = '''
+    INSERT INTO analysis_results 
+    (timestamp, filename, language, total_vulnerabilities, 
+     critical_count, high_count, medium_count, low_count, info_count, results_blob,
+     max_severity_rank)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_CACHE_INSERT_SQL = '''
+    INSERT OR REPLACE INTO finding_cache (content_hash, file_ext, semgrep_stamp, findings_blob)
+    VALUES (?, ?, ?, ?)
+'''
+_FILE_CACHE_HIT_SQL = '''
+    SELECT 1 FROM file_cache WHERE content_hash = ? AND patterns_hash = ?
+'''
+_FILE_CACHE_INSERT_SQL = '''
+    INSERT OR REPLACE INTO file_cache (content_hash, patterns_hash, findings_blob)
+    VALUES (?, ?, ?)
+'''
+
+# History queries re-run on every scroll page and filter change
+_HISTORY_COUNT_SQL = '''
+    SELECT COUNT(*) FROM analysis_results WHERE max_severity_rank >= ?
+'''
+_HISTORY_PAGE_SQL = '''
+    SELECT timestamp, filename, language, total_vulnerabilities, 
+           critical_count, high_count 
+    FROM analysis_results 
+    WHERE max_severity_rank >= ?
+    ORDER BY id DESC 
+    LIMIT ? OFFSET ?
+'''
+
+# Dashboard totals: scans, critical issues, distinct files, scans without criticals
+_DASHBOARD_STATS_SQL = '''
+    SELECT COUNT(*), COALESCE(SUM(critical_count), 0), COUNT(DISTINCT filename),
+           COALESCE(SUM(critical_count = 0), 0)
+    FROM analysis_results
+'''
+
+# HTML report pieces written by export_html; filled in with str.format
+_HTML_REPORT_HEADER = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Bug Analysis Report</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
+                .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; }}
+                .header {{ background: #2d2d2d; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
+                .stats {{ display: flex; gap: 20px; margin: 20px 0; }}
+                .stat-card {{ background: #f8f9fa; padding: 15px; border-radius: 8px; flex: 1; text-align: center; }}
+                .critical {{ color: #f44336; font-weight: bold; }}
+                .high {{ color: #ff9800; font-weight: bold; }}
+                .medium {{ color: #ffeb3b; font-weight: bold; }}
+                .low {{ color: #4caf50; font-weight: bold; }}
+                .info {{ color: #2196f3; font-weight: bold; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>🔍 Bug Analysis Report</h1>
+                    <p>Generated on {generated}</p>
+                </div>
+        """
+_HTML_REPORT_STATS = """
+                <div class="stats">
+                    <div class="stat-card">
+                        <h3>Total Vulnerabilities</h3>
+                        <h2>{total}</h2>
+                    </div>
+                    <div class="stat-card">
+                        <h3>Critical</h3>
+                        <h2 class="critical">{critical}</h2>
+                    </div>
+                    <div class="stat-card">
+                        <h3>High</h3>
+                        <h2 class="high">{high}</h2>
+                    </div>
+                    <div class="stat-card">
+                        <h3>Medium</h3>
+                        <h2 class="medium">{medium}</h2>
+                    </div>
+                    <div class="stat-card">
+                        <h3>Low</h3>
+                        <h2 class="low">{low}</h2>
+                    </div>
+                </div>
+                <h2>Analysis Details</h2>
+                <p><strong>File:</strong> {filename}</p>
+                <p><strong>Language:</strong> {language}</p>
+                <p><strong>Timestamp:</strong> {timestamp}</p>
+            """
+_HTML_REPORT_FOOTER = """
+            </div>
+        </body>
+        </html>
+        """
+
+def compress_results(vulnerabilities):
+    """Serialize findings to JSON and zlib-compress them for the results_blob column"""
+    return zlib.compress(json.dumps(vulnerabilities).encode('utf-8'))
+
+def decompress_results(blob):
+    """Inverse of compress_results"""
+    return json.loads(zlib.decompress(blob))
+
+def findings_max_rank(vulnerabilities):
+    """Highest SEVERITY_RANKS value among findings, 0 when there are none
+    
+    Ranked from the findings themselves, since a summary drops Semgrep's
+    ERROR/WARNING levels.
+    """
+    return max((SEVERITY_RANKS.get(vuln.get('severity'), 0) for vuln in vulnerabilities
+                if isinstance(vuln, dict)), default=0)
+
+def results_json_text(results_json, results_blob):
+    """Return a history row's findings as JSON text, whichever column holds them"""
+    if results_blob is not None:
+        return zlib.decompress(results_blob).decode('utf-8')
+    return results_json
+
+# ttk styles for the dark theme, applied in order by setup_styles
+_STYLE_TABLE = (
+    # Main frame style
+    ('Main.TFrame', {'background': '#1e1e1e'}),
+    
+    # Header style
+    ('Header.TFrame', {'background': '#2d2d2d', 'relief': 'raised', 'borderwidth': 1}),
+    ('Header.TLabel', {'background': '#2d2d2d', 'foreground': '#ffffff',
+                       'font': ('Segoe UI', 16, 'bold')}),
+    
+    # Tab styles
+    ('Custom.TNotebook', {'background': '#1e1e1e', 'borderwidth': 0}),
+    ('Custom.TNotebook.Tab', {'background': '#3d3d3d', 'foreground': '#ffffff',
+                              'padding': [20, 10], 'font': ('Segoe UI', 10)}),
+    
+    # Button styles
+    ('Primary.TButton', {'background': '#0078d4', 'foreground': '#ffffff',
+                         'font': ('Segoe UI', 10, 'bold'), 'padding': [15, 8]}),
+    ('Secondary.TButton', {'background': '#404040', 'foreground': '#ffffff',
+                           'font': ('Segoe UI', 9), 'padding': [12, 6]}),
+    
+    # Frame styles
+    ('Card.TFrame', {'background': '#2d2d2d', 'relief': 'raised', 'borderwidth': 1}),
+    ('Content.TFrame', {'background': '#1e1e1e'}),
+    
+    # Label styles
+    ('Title.TLabel', {'background': '#1e1e1e', 'foreground': '#ffffff',
+                      'font': ('Segoe UI', 12, 'bold')}),
+    ('Content.TLabel', {'background': '#1e1e1e', 'foreground': '#e0e0e0',
+                        'font': ('Segoe UI', 9)}),
+    ('Success.TLabel', {'background': '#1e1e1e', 'foreground': '#4caf50',
+                        'font': ('Segoe UI', 9, 'bold')}),
+    ('Warning.TLabel', {'background': '#1e1e1e', 'foreground': '#ff9800',
+                        'font': ('Segoe UI', 9, 'bold')}),
+    ('Error.TLabel', {'background': '#1e1e1e', 'foreground': '#f44336',
+                      'font': ('Segoe UI', 9, 'bold')}),
+    
+    # Entry and combobox styles
+    ('Modern.TEntry', {'fieldbackground': '#404040', 'foreground': '#ffffff',
+                       'borderwidth': 1, 'insertcolor': '#ffffff'}),
+    ('Modern.TCombobox', {'fieldbackground': '#404040', 'foreground': '#ffffff',
+                          'borderwidth': 1}),
+    
+    # Progressbar style
+    ('Modern.Horizontal.TProgressbar', {'background': '#0078d4', 'troughcolor': '#404040',
+                                        'borderwidth': 0, 'lightcolor': '#0078d4',
+                                        'darkcolor': '#0078d4'}),
+)
+
+# State-dependent style options, applied after _STYLE_TABLE
+_STYLE_MAPS = (
+    ('Custom.TNotebook.Tab', {'background': [('selected', '#0078d4'), ('active', '#4d4d4d')]}),
+    ('Primary.TButton', {'background': [('active', '#106ebe'), ('pressed', '#005a9e')]}),
+    ('Secondary.TButton', {'background': [('active', '#505050'), ('pressed', '#303030')]}),
+)
+
 class ResponsiveFrame(ttk.Frame):
     """Custom frame that handles responsive behavior"""
     def __init__(self, parent, **kwargs):
@@ -25,11 +233,308 @@ class ResponsiveFrame(ttk.Frame):
         """Override in subclasses for custom responsive behavior"""
         pass
 
+def stream_semgrep_results(cmd, timeout):
+    """Yield semgrep findings one at a time as they are parsed from stdout
+    
+    Raises subprocess.TimeoutExpired if semgrep runs longer than timeout seconds
+    and subprocess.CalledProcessError if it exits with an error. Closing the
+    generator early terminates the semgrep process.
+    """
+    expired = threading.Event()
+    
+    # stderr goes to a file so a chatty semgrep can never block on a full pipe
+    with tempfile.TemporaryFile() as stderr, \
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr,
+                             bufsize=1024 * 1024) as proc:
+        def kill():
+            expired.set()
+            proc.kill()
+            
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            if ijson is not None:
+                try:
+                    yield from ijson.items(proc.stdout, 'results.item', use_float=True)
+                except ijson.JSONError:
+                    pass
+            else:
+                try:
+                    yield from parse_json_bytes(proc.stdout.read()).get('results', [])
+                except json.JSONDecodeError:
+                    pass
+            proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.terminate()
+                
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                proc.returncode, cmd, stderr=stderr.read().decode('utf-8', errors='replace'))
+
+def line_confined(pattern):
+    """Rewrite a single-line pattern so it can never match across a newline
+    
+    Negated classes and \\s are the only constructs in the built-in patterns
+    that can consume '\\n'; '.' already stops at it.
+    """
+    pattern = pattern.replace('[^', '[^\\n')
+    return pattern.replace('\\s', '[^\\S\\n]')
+
+# Files longer than this (in characters) are skipped by the pattern scan,
+# e.g. minified bundles; only one character past it is ever read
+MAX_SCAN_BYTES = 2 * 1024 * 1024
+
+def line_offsets(text):
+    """Return the offset at which each line of text (str or bytes) starts"""
+    # A list of match ends beat str.find loops, split/accumulate and
+    # array.array builds on real source files
+    newline = '\n' if isinstance(text, str) else b'\n'
+    return [0] + [m.end() for m in re.finditer(newline, text)]
+
+def read_source(file_path):
+    """Read a source file as text, replacing undecodable bytes"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read(MAX_SCAN_BYTES + 1)
+
+# Files are streamed through the content hash this many bytes at a time
+READ_CHUNK_BYTES = 1024 * 1024
+
+def read_and_hash(file_path):
+    """Read a source file once for both its content digest and its text
+    
+    Returns (digest, text). The whole file is hashed, but only text up to
+    read_source's limit is decoded and kept, identical to what read_source
+    returns (the same decoder and newline translation as text mode).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder('utf-8')('replace'), translate=True)
+    parts = []
+    kept = 0
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(READ_CHUNK_BYTES):
+            digest.update(chunk)
+            if kept <= MAX_SCAN_BYTES:
+                parts.append(decoder.decode(chunk))
+                kept += len(parts[-1])
+    if kept <= MAX_SCAN_BYTES:
+        parts.append(decoder.decode(b'', final=True))
+    return digest.hexdigest(), ''.join(parts)[:MAX_SCAN_BYTES + 1]
+
+class PatternScanner:
+    """Matches the built-in vulnerability patterns against source files
+    
+    Holds no GUI state, so directory scans can build one per worker process.
+    """
+    
+    def __init__(self, vulnerability_patterns, severity_map):
+        # Kept as separate regexes on purpose: one fused alternation (lookahead
+        # groups, so overlapping hits survive) scanned 2-5x slower on CPython's
+        # backtracking engine, which can't use each pattern's literal prefix
+        # to skip ahead once the patterns are combined
+        # Severity is resolved here too, so the scan loop does no lookups
+        self._compiled_patterns = tuple(
+            (vuln_type, description, re.compile(line_confined(pattern)), severity_map[vuln_type])
+            for vuln_type, pattern_list in vulnerability_patterns.items()
+            for pattern, description in pattern_list
+        )
+        self._hs_db = self._build_hyperscan_db()
+        # Identifies this pattern set in the file_cache table
+        self.fingerprint = hashlib.blake2b(
+            json.dumps([vulnerability_patterns, severity_map, MAX_SCAN_BYTES]).encode('utf-8'),
+            digest_size=16).hexdigest()
+        
+    def _build_hyperscan_db(self):
+        """Compile the built-in patterns into one Hyperscan block-mode database"""
+        if hyperscan is None:
+            return None
+        
+        expressions, flags = [], []
+        for _, _, regex, _ in self._compiled_patterns:
+            pattern, flag = regex.pattern, 0
+            if pattern.startswith('(?i)'):
+                pattern, flag = pattern[4:], hyperscan.HS_FLAG_CASELESS
+            # A trailing '.*' never changes which lines match, but would make
+            # Hyperscan report a match at every following offset
+            if pattern.endswith('.*'):
+                pattern = pattern[:-2]
+            expressions.append(pattern.encode())
+            flags.append(flag)
+        
+        try:
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=flags
+            )
+            return db
+        except hyperscan.error as e:
+            print(f"Hyperscan compile failed, using regex scanning: {e}")
+            return None
+        
+    def _match_lines_hyperscan(self, content, line_starts):
+        """Return, per built-in pattern, the sorted line numbers it matches"""
+        if content.isascii():
+            # One byte per character, so the character offsets apply as-is
+            buf = content.encode('ascii')
+        else:
+            buf = content.encode('utf-8', 'replace')
+            line_starts = line_offsets(buf)
+        hits = [set() for _ in self._compiled_patterns]
+        
+        # The per-match callback is the only Python left inside the scan, and
+        # a small share of it next to building line offsets, so a compiled
+        # extension driving Hyperscan would not pay for its build step
+        def on_match(pattern_id, start, end, flags, context):
+            # Matches never span a newline, so the last matched byte is on
+            # the same line as the first
+            hits[pattern_id].add(bisect_right(line_starts, end - 1))
+        
+        self._hs_db.scan(buf, match_event_handler=on_match)
+        return [sorted(lines) for lines in hits]
+        
+    def _match_lines_regex(self, content, line_starts):
+        """Return, per built-in pattern, the sorted line numbers it matches"""
+        # Scan the whole file once per pattern; patterns are line-confined,
+        # so this reports exactly the lines a per-line search would
+        hits = []
+        for _, _, regex, _ in self._compiled_patterns:
+            lines = []
+            for match in regex.finditer(content):
+                line_num = bisect_right(line_starts, match.start())
+                if not lines or lines[-1] != line_num:
+                    lines.append(line_num)
+            hits.append(lines)
+        return hits
+        
+    def scan(self, file_path, content=None):
+        """Return the built-in pattern findings for one file
+        
+        content may be passed in when the file has already been read.
+        """
+        vulnerabilities = []
+        
+        try:
+            if content is None:
+                content = read_source(file_path)
+            if len(content) > MAX_SCAN_BYTES:
+                print(f"Skipping pattern scan of {file_path}: larger than {MAX_SCAN_BYTES} bytes")
+                return vulnerabilities
+            if '\x00' in content:
+                print(f"Skipping pattern scan of {file_path}: looks binary")
+                return vulnerabilities
+                
+            # Offset at which each line starts; bisect maps a match back to its line
+            line_starts = line_offsets(content)
+            
+            if self._hs_db is not None:
+                hits = self._match_lines_hyperscan(content, line_starts)
+            else:
+                hits = self._match_lines_regex(content, line_starts)
+            
+            # Findings stay plain dicts rather than parallel column arrays: this
+            # is the shape stored in results_blob and the caches, exported as
+            # JSON and read by the results view, and Semgrep findings join the
+            # same list
+            for (vuln_type, description, _, severity), lines in zip(self._compiled_patterns, hits):
+                for line_num in lines:
+                    start = line_starts[line_num - 1]
+                    end = line_starts[line_num] - 1 if line_num < len(line_starts) else len(content)
+                    vulnerabilities.append({
+                        'type': vuln_type,
+                        'description': description,
+                        'line': line_num,
+                        'code': content[start:end].strip(),
+                        'severity': severity,
+                        'file': file_path
+                    })
+                    
+        except Exception as e:
+            print(f"Error detecting vulnerabilities: {e}")
+            
+        return vulnerabilities
+
+# Per-process scanner for directory scan workers, built by _init_scan_worker,
+# and a read-only connection for file_cache lookups when one was requested
+_worker_scanner = None
+_worker_cache = None
+
+def _init_scan_worker(vulnerability_patterns, severity_map, cache_db=None):
+    """Compile the patterns once in each worker process"""
+    global _worker_scanner, _worker_cache
+    _worker_scanner = PatternScanner(vulnerability_patterns, severity_map)
+    if cache_db is not None:
+        try:
+            _worker_cache = sqlite3.connect(f'file:{cache_db}?mode=ro', uri=True)
+        except sqlite3.Error as e:
+            print(f"Finding cache error: {e}")
+
+def _scan_in_worker(file_path):
+    """Run the built-in patterns over one file in a worker process"""
+    return _worker_scanner.scan(file_path)
+
+def _hash_and_scan_in_worker(file_path):
+    """Hash one file in a worker process, scanning it unless file_cache has it
+    
+    Returns (digest, findings); findings is None for cached content and
+    digest is None when the file could not be read.
+    """
+    try:
+        digest, content = read_and_hash(file_path)
+    except OSError:
+        # Scanning again reports the error
+        return None, _worker_scanner.scan(file_path)
+    
+    if _worker_cache is not None:
+        try:
+            row = _worker_cache.execute(
+                _FILE_CACHE_HIT_SQL, (digest, _worker_scanner.fingerprint)).fetchone()
+            if row is not None:
+                return digest, None
+        except sqlite3.Error:
+            pass
+    return digest, _worker_scanner.scan(file_path, content)
+
+# File types picked up by directory scans
+SUPPORTED_EXTS = ('.py', '.js', '.java', '.c', '.cpp', '.php', '.rb', '.go', '.rs')
+
+def iter_source_files(root):
+    """Yield paths of supported source files under root, depth first
+    
+    DirEntry carries the file type from the directory read itself, so no
+    per-file stat is needed. Unreadable directories are skipped.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_source_files(entry.path)
+                elif entry.name.lower().endswith(SUPPORTED_EXTS) and entry.is_file():
+                    yield entry.path
+    except OSError:
+        return
+
 class SemgrepAnalyzer:
+    """Semgrep runner; the only per-instance state is the installation probe"""
+    # Rule set passed to --config
+    CONFIG = 'auto'
+    
     def __init__(self):
-        pass
+        # Result of the `semgrep --version` probe, filled in on first use
+        self._installed = None
+        self.version = ''
 
     def check_semgrep_installation(self):
+        if self._installed is not None:
+            return self._installed
+            
         try:
             result = subprocess.run(
                 ['semgrep', '--version'], 
@@ -39,45 +544,67 @@ class SemgrepAnalyzer:
                 errors='replace',
                 timeout=10
             )
-            return result.returncode == 0
+            self._installed = result.returncode == 0
+            self.version = result.stdout.strip()
         except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-            return False
+            self._installed = False
+        return self._installed
+        
+    @property
+    def cache_stamp(self):
+        """Identifies the Semgrep build and rule config behind cached findings"""
+        return f"{self.version} --config={self.CONFIG}"
 
-    def run_semgrep_analysis(self, file_path, language):
-        try:
-            # Semgrep command with proper encoding handling
-            cmd = [
-                'semgrep', 
-                '--config=auto', 
-                '--json', 
-                '--quiet',
-                file_path
-            ]
-            
-            # Fix encoding issue for Windows
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                encoding='utf-8',  # Force UTF-8 encoding
-                errors='replace',  # Replace problematic characters
-                timeout=30
-            )
+    @staticmethod
+    def scan(paths, jobs=None):
+        """Run Semgrep once over one or more files or directories
+        
+        Semgrep walks directories itself and parallelizes across files, so all
+        targets share a single process start-up and rule load. jobs defaults to
+        one per CPU. Errors propagate to the caller.
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        paths = [os.fspath(path) for path in paths]
+        if not paths:
+            return []
             
-            if result.returncode == 0:
-                try:
-                    findings = json.loads(result.stdout)
-                    return findings.get('results', [])
-                except json.JSONDecodeError:
-                    return []
-            else:
-                # Log error but don't crash
-                print(f"Semgrep error: {result.stderr}")
-                return []
+        cmd = [
+            'semgrep', 
+            f'--config={SemgrepAnalyzer.CONFIG}', 
+            '--json', 
+            '--quiet',
+            '--jobs', str(jobs or os.cpu_count() or 1),
+            *paths
+        ]
+        return list(stream_semgrep_results(cmd, timeout=30 * len(paths)))
+
+    @staticmethod
+    def scan_batch(paths):
+        """Scan one slice of files with a single-job Semgrep process
+        
+        Returns None when Semgrep fails, so callers can tell that apart from a
+        clean scan with no findings.
+        """
+        try:
+            return SemgrepAnalyzer.scan(paths, jobs=1)
+        except Exception as e:
+            print(f"Error running semgrep: {e}")
+            return None
+
+    @staticmethod
+    def run_semgrep_analysis(paths, language, jobs=None):
+        """Run Semgrep over the given paths, returning [] on any failure"""
+        try:
+            return SemgrepAnalyzer.scan(paths, jobs)
             
         except subprocess.TimeoutExpired:
             print("Semgrep analysis timed out")
             return []
+        except subprocess.CalledProcessError as e:
+            # Log error but don't crash
+            print(f"Semgrep error: {e.stderr}")
+            return []
         except FileNotFoundError:
             print("Semgrep not found. Please install semgrep first.")
             return []
@@ -85,22 +612,109 @@ class SemgrepAnalyzer:
             print(f"Error running semgrep: {e}")
             return []
 
-    def analyze_code(self, file_path, language):
+    def analyze_code(self, paths, language):
+        """Analyze files and/or directories (scanned recursively by Semgrep)"""
         if not self.check_semgrep_installation():
             print("Semgrep is not installed or not in PATH.")
             return []
 
-        findings = self.run_semgrep_analysis(file_path, language)
+        findings = self.run_semgrep_analysis(paths, language)
         return findings
 
 class ModernBugPredictionGUI:
+    # Most history rows the writer thread commits per transaction
+    WRITER_BATCH_ROWS = 500
+    # Interval between UI update batches from worker threads (~20 Hz)
+    UI_DRAIN_MS = 50
+    # History rows fetched per query, and how many such pages stay cached
+    HISTORY_PAGE_ROWS = 50
+    HISTORY_CACHED_PAGES = 64
+    # Upper bound on files per Semgrep process in directory scans
+    SEMGREP_BATCH_FILES = 100
+    # Directory scans smaller than this run the built-in patterns in-process
+    PARALLEL_SCAN_MIN_FILES = 500
+    # Files handed to a pattern-scan worker at a time
+    PARALLEL_SCAN_CHUNK = 8
+    # In-process scans read this many files ahead on READ_THREADS threads
+    READ_AHEAD_FILES = 32
+    READ_THREADS = 8
+    # Findings (or per-file summaries) inserted into the results view per page,
+    # RESULTS_BATCH_ITEMS at a time between idle ticks
+    RESULTS_PAGE_ITEMS = 200
+    RESULTS_BATCH_ITEMS = 50
+    # Files with the most findings kept for a directory scan's results view
+    DIRECTORY_TOP_FILES = 20
+    # File name reported for code pasted into the editor
+    DIRECT_INPUT_NAME = 'Direct Code Input'
+    
+    # Built-in vulnerability patterns: type -> [(regex, description), ...]
+    VULNERABILITY_PATTERNS = {
+        'SQL Injection': [
+            (r'(?i)(SELECT|INSERT|UPDATE|DELETE).*\+.*', 'String concatenation in SQL query'),
+            (r'(?i)1\s*OR\s*1\s*=\s*1', 'Classic SQL injection pattern'),
+            (r'(?i)UNION\s+SELECT', 'UNION-based SQL injection'),
+            (r'(?i);\s*DROP\s+TABLE', 'SQL injection with DROP statement'),
+        ],
+        'Cross-Site Scripting (XSS)': [
+            (r'innerHTML\s*=\s*[^;]*\+', 'Unsafe innerHTML assignment'),
+            (r'document\.write\s*\([^)]*\+', 'Unsafe document.write usage'),
+            (r'<script[^>]*>[^<]*</script>', 'Inline script tag'),
+        ],
+        'Command Injection': [
+            (r'os\.system\s*\([^)]*\+', 'Command injection via os.system'),
+            (r'subprocess\.[^(]*\([^)]*shell\s*=\s*True', 'Shell injection risk'),
+            (r'eval\s*\([^)]*input', 'Code injection via eval'),
+        ],
+        'Path Traversal': [
+            (r'\.\./', 'Directory traversal pattern'),
+            (r'open\s*\([^)]*\+[^)]*["\'][^"\']*["\']', 'Unsafe file path construction'),
+        ],
+        'Hardcoded Credentials': [
+            (r'(?i)(password|pwd|pass)\s*=\s*["\'][^"\']{3,}["\']', 'Hardcoded password'),
+            (r'(?i)(api_key|apikey|secret)\s*=\s*["\'][^"\']{10,}["\']', 'Hardcoded API key'),
+        ],
+        'Weak Cryptography': [
+            (r'hashlib\.md5\s*\(', 'Weak MD5 hash usage'),
+            (r'hashlib\.sha1\s*\(', 'Weak SHA1 hash usage'),
+            (r'(?i)DES|RC4', 'Weak encryption algorithm'),
+        ],
+        'Unsafe Deserialization': [
+            (r'pickle\.loads?\s*\(', 'Unsafe pickle deserialization'),
+            (r'yaml\.load\s*\([^)]*Loader', 'Unsafe YAML loading'),
+        ],
+        'Information Disclosure': [
+            (r'(?i)debug\s*=\s*True', 'Debug mode enabled'),
+            (r'print\s*\([^)]*password', 'Password in debug output'),
+            (r'console\.log\s*\([^)]*token', 'Token in console output'),
+        ]
+    }
+    
+    # Severity of each built-in vulnerability type; anything else is LOW
+    VULNERABILITY_SEVERITIES = {
+        'SQL Injection': 'CRITICAL',
+        'Command Injection': 'CRITICAL',
+        'Unsafe Deserialization': 'CRITICAL',
+        'Hardcoded Credentials': 'CRITICAL',
+        'Cross-Site Scripting (XSS)': 'HIGH',
+        'Path Traversal': 'HIGH',
+        'Weak Cryptography': 'MEDIUM',
+        'Information Disclosure': 'MEDIUM',
+    }
+    
     def __init__(self, root):
         self.root = root
+        # Shared so the memoized installation probe is paid once per session
+        self.semgrep_analyzer = SemgrepAnalyzer()
         self.setup_window()
         self.setup_variables()
         self.setup_database()
+        self.setup_patterns()
         self.create_modern_ui()
         self.setup_responsive_behavior()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Probe semgrep in the background so the first analysis doesn't wait on it
+        threading.Thread(target=self.semgrep_analyzer.check_semgrep_installation, daemon=True).start()
         
     def setup_window(self):
         """Configure main window for 14-inch screen optimization"""
@@ -139,10 +753,28 @@ class ModernBugPredictionGUI:
         self.min_severity = tk.StringVar(value="INFO")
         self.current_tab = tk.StringVar(value="analysis")
         
+        # Callbacks queued by worker threads, applied on the Tk thread by _drain_ui
+        self._ui_q = queue.Queue()
+        
+        # Font size mode currently applied, and the pending debounced resize
+        self._size_mode = None
+        self._resize_after = None
+        
     def setup_database(self):
         """Initialize SQLite database"""
+        self._write_q = queue.Queue()
+        self._writer_thread = None
+        self._history_refresh_pending = False
         try:
-            self.conn = sqlite3.connect('bug_analysis.db')
+            # Rows are written by _db_writer_loop; the Tk thread only reads
+            # Absolute, so directory scan workers can open it for cache lookups
+            self._db_path = os.path.abspath('bug_analysis.db')
+            self.conn = sqlite3.connect(self._db_path, check_same_thread=False,
+                                        isolation_level=None, cached_statements=256)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA temp_store=MEMORY')
+            self.conn.execute('PRAGMA cache_size=-65536')
             self.cursor = self.conn.cursor()
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS analysis_results (
@@ -156,13 +788,100 @@ class ModernBugPredictionGUI:
                     medium_count INTEGER,
                     low_count INTEGER,
                     info_count INTEGER,
-                    results_json TEXT
+                    results_json TEXT,
+                    max_severity_rank INTEGER NOT NULL DEFAULT 0,
+                    results_blob BLOB
+                )
+            ''')
+            
+            # Bring databases created by older versions up to the current columns
+            columns = {row[1] for row in self.cursor.execute('PRAGMA table_info(analysis_results)')}
+            if 'max_severity_rank' not in columns:
+                self.cursor.execute('''
+                    ALTER TABLE analysis_results 
+                    ADD COLUMN max_severity_rank INTEGER NOT NULL DEFAULT 0
+                ''')
+                self.cursor.execute('''
+                    UPDATE analysis_results SET max_severity_rank = CASE
+                        WHEN critical_count > 0 THEN 4
+                        WHEN high_count > 0 THEN 3
+                        WHEN medium_count > 0 THEN 2
+                        WHEN low_count > 0 THEN 1
+                        ELSE 0
+                    END
+                ''')
+                self._backfill_finding_ranks()
+            if 'results_blob' not in columns:
+                # Findings are stored compressed; results_json stays for older rows
+                self.cursor.execute('ALTER TABLE analysis_results ADD COLUMN results_blob BLOB')
+            self.cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_analysis_results_severity 
+                ON analysis_results(max_severity_rank)
+            ''')
+            # Exports fetch the latest result by timestamp
+            self.cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_analysis_results_timestamp 
+                ON analysis_results(timestamp)
+            ''')
+            
+            # Semgrep findings keyed by file content and extension (which picks
+            # the language), so unchanged files skip rescans; semgrep_stamp ties
+            # each entry to the Semgrep version and config that produced it
+            cache_columns = {row[1] for row in self.cursor.execute('PRAGMA table_info(finding_cache)')}
+            if cache_columns and 'semgrep_stamp' not in cache_columns:
+                # Older caches were keyed by content alone; let them rebuild
+                self.cursor.execute('DROP TABLE finding_cache')
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS finding_cache (
+                    content_hash TEXT NOT NULL,
+                    file_ext TEXT NOT NULL,
+                    semgrep_stamp TEXT NOT NULL,
+                    findings_blob BLOB,
+                    PRIMARY KEY (content_hash, file_ext)
+                )
+            ''')
+            # Built-in pattern findings likewise; patterns_hash ties each entry
+            # to the pattern set that produced it
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_cache (
+                    content_hash TEXT PRIMARY KEY,
+                    patterns_hash TEXT NOT NULL,
+                    findings_blob BLOB
                 )
             ''')
-            self.conn.commit()
+            self._writer_thread = threading.Thread(target=self._db_writer_loop, daemon=True)
+            self._writer_thread.start()
         except Exception as e:
             print(f"Database setup error: {e}")
             
+    def _backfill_finding_ranks(self):
+        """Raise migrated rows' max_severity_rank to their stored findings' rank
+        
+        The counts columns miss Semgrep-only findings (ERROR/WARNING), so the
+        stored findings are ranked the same way _result_row ranks new rows.
+        """
+        updates = []
+        for row_id, results_json in self.conn.execute(
+                'SELECT id, results_json FROM analysis_results WHERE results_json IS NOT NULL'):
+            try:
+                findings = json.loads(results_json)
+            except ValueError:
+                continue
+            if isinstance(findings, list):
+                updates.append((findings_max_rank(findings), row_id))
+                
+        self.conn.execute('BEGIN')
+        self.conn.executemany(
+            'UPDATE analysis_results SET max_severity_rank = MAX(max_severity_rank, ?) WHERE id = ?',
+            updates)
+        self.conn.execute('COMMIT')
+        
+    def setup_patterns(self):
+        """Compile the built-in vulnerability patterns once per session"""
+        self._severity_map = {vuln_type: self.get_severity(vuln_type)
+                              for vuln_type in self.VULNERABILITY_PATTERNS}
+        self._scanner = PatternScanner(self.VULNERABILITY_PATTERNS, self._severity_map)
+        
     def create_modern_ui(self):
         """Create the modern, responsive UI"""
         # Configure modern styling
@@ -190,59 +909,11 @@ class ModernBugPredictionGUI:
         # Configure dark theme
         style.theme_use('clam')
         
-        # Main frame style
-        style.configure('Main.TFrame', background='#1e1e1e')
-        
-        # Header style
-        style.configure('Header.TFrame', background='#2d2d2d', relief='raised', borderwidth=1)
-        style.configure('Header.TLabel', background='#2d2d2d', foreground='#ffffff', 
-                       font=('Segoe UI', 16, 'bold'))
-        
-        # Tab styles
-        style.configure('Custom.TNotebook', background='#1e1e1e', borderwidth=0)
-        style.configure('Custom.TNotebook.Tab', background='#3d3d3d', foreground='#ffffff',
-                       padding=[20, 10], font=('Segoe UI', 10))
-        style.map('Custom.TNotebook.Tab', 
-                 background=[('selected', '#0078d4'), ('active', '#4d4d4d')])
-        
-        # Button styles
-        style.configure('Primary.TButton', background='#0078d4', foreground='#ffffff',
-                       font=('Segoe UI', 10, 'bold'), padding=[15, 8])
-        style.map('Primary.TButton',
-                 background=[('active', '#106ebe'), ('pressed', '#005a9e')])
-        
-        style.configure('Secondary.TButton', background='#404040', foreground='#ffffff',
-                       font=('Segoe UI', 9), padding=[12, 6])
-        style.map('Secondary.TButton',
-                 background=[('active', '#505050'), ('pressed', '#303030')])
-        
-        # Frame styles
-        style.configure('Card.TFrame', background='#2d2d2d', relief='raised', borderwidth=1)
-        style.configure('Content.TFrame', background='#1e1e1e')
-        
-        # Label styles
-        style.configure('Title.TLabel', background='#1e1e1e', foreground='#ffffff',
-                       font=('Segoe UI', 12, 'bold'))
-        style.configure('Content.TLabel', background='#1e1e1e', foreground='#e0e0e0',
-                       font=('Segoe UI', 9))
-        style.configure('Success.TLabel', background='#1e1e1e', foreground='#4caf50',
-                       font=('Segoe UI', 9, 'bold'))
-        style.configure('Warning.TLabel', background='#1e1e1e', foreground='#ff9800',
-                       font=('Segoe UI', 9, 'bold'))
-        style.configure('Error.TLabel', background='#1e1e1e', foreground='#f44336',
-                       font=('Segoe UI', 9, 'bold'))
-        
-        # Entry and combobox styles
-        style.configure('Modern.TEntry', fieldbackground='#404040', foreground='#ffffff',
-                       borderwidth=1, insertcolor='#ffffff')
-        style.configure('Modern.TCombobox', fieldbackground='#404040', foreground='#ffffff',
-                       borderwidth=1)
-        
-        # Progressbar style
-        style.configure('Modern.Horizontal.TProgressbar', background='#0078d4',
-                       troughcolor='#404040', borderwidth=0, lightcolor='#0078d4',
-                       darkcolor='#0078d4')
-        
+        for name, options in _STYLE_TABLE:
+            style.configure(name, **options)
+        for name, options in _STYLE_MAPS:
+            style.map(name, **options)
+            
     def create_header(self):
         """Create responsive header section"""
         header_frame = ttk.Frame(self.main_container, style='Header.TFrame')
@@ -442,6 +1113,11 @@ class ModernBugPredictionGUI:
         )
         self.results_text.grid(row=0, column=0, sticky='nsew', padx=10, pady=10)
         
+        # Long result lists are rendered a page at a time as the view nears the end
+        self._results_backlog = None
+        self._render_after = None
+        self.results_text.configure(yscrollcommand=self._on_results_yscroll)
+        
         # Configure text tags for colored output
         self.results_text.tag_configure('critical', foreground='#f44336', font=('Consolas', 9, 'bold'))
         self.results_text.tag_configure('high', foreground='#ff9800', font=('Consolas', 9, 'bold'))
@@ -530,14 +1206,25 @@ class ModernBugPredictionGUI:
             self.history_tree.heading(col, text=col)
             self.history_tree.column(col, width=120, anchor='center')
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(history_container, orient='vertical', command=self.history_tree.yview)
+        # Scrollbars; the vertical one drives the virtual window, not the Treeview
+        self.history_scrollbar = ttk.Scrollbar(history_container, orient='vertical', command=self._on_history_scroll)
         h_scrollbar = ttk.Scrollbar(history_container, orient='horizontal', command=self.history_tree.xview)
-        self.history_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.history_tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        # Only the rows in view live in the Treeview; pages are fetched on demand
+        self._history_total = 0
+        self._history_top = 0
+        self._history_visible = int(self.history_tree.cget('height'))
+        self._history_pages = {}
+        self.history_tree.bind('<Configure>', self._on_history_resize)
+        self.history_tree.bind('<MouseWheel>', self._on_history_wheel)
+        self.history_tree.bind('<Button-4>', self._on_history_wheel)
+        self.history_tree.bind('<Button-5>', self._on_history_wheel)
+        self.min_severity.trace_add('write', lambda *args: self.refresh_history())
         
         # Grid layout
         self.history_tree.grid(row=0, column=0, sticky='nsew', padx=10, pady=10)
-        v_scrollbar.grid(row=0, column=1, sticky='ns', pady=10)
+        self.history_scrollbar.grid(row=0, column=1, sticky='ns', pady=10)
         h_scrollbar.grid(row=1, column=0, sticky='ew', padx=10)
         
     def create_settings_tab(self):
@@ -605,22 +1292,41 @@ class ModernBugPredictionGUI:
     def setup_responsive_behavior(self):
         """Setup responsive behavior for window resizing"""
         self.root.bind('<Configure>', self.on_window_resize)
+        self.root.after(self.UI_DRAIN_MS, self._drain_ui)
+        
+    def _drain_ui(self):
+        """Apply queued UI updates in one batch, then re-arm the timer"""
+        try:
+            while True:
+                callback, args = self._ui_q.get_nowait()
+                try:
+                    callback(*args)
+                except Exception as e:
+                    print(f"UI update error: {e}")
+        except queue.Empty:
+            pass
+        self.root.after(self.UI_DRAIN_MS, self._drain_ui)
         
     def on_window_resize(self, event):
         """Handle window resize events"""
         if event.widget == self.root:
-            # Adjust UI elements based on window size
-            width = self.root.winfo_width()
-            height = self.root.winfo_height()
-            
-            # Adjust font sizes for smaller screens
-            if width < 1200:
-                # Smaller font for compact view
-                self.update_font_sizes('small')
-            else:
-                # Normal font sizes
-                self.update_font_sizes('normal')
-                
+            # Wait for the drag to settle instead of restyling on every pixel
+            if self._resize_after:
+                self.root.after_cancel(self._resize_after)
+            self._resize_after = self.root.after(150, self._apply_resize)
+            
+    def _apply_resize(self):
+        """Adjust UI elements once the window size has settled"""
+        self._resize_after = None
+        width = self.root.winfo_width()
+        
+        # Smaller fonts for compact view, normal sizes otherwise
+        size_mode = 'small' if width < 1200 else 'normal'
+        if size_mode == self._size_mode:
+            return
+        self._size_mode = size_mode
+        self.update_font_sizes(size_mode)
+        
     def update_font_sizes(self, size_mode):
         """Update font sizes based on screen size"""
         if size_mode == 'small':
@@ -643,6 +1349,8 @@ class ModernBugPredictionGUI:
     # Analysis methods (keeping existing functionality)
     def select_file(self):
         """Select a single file for analysis"""
+        from tkinter import filedialog
+        
         file_path = filedialog.askopenfilename(
             title="Select Code File",
             filetypes=[
@@ -661,6 +1369,8 @@ class ModernBugPredictionGUI:
             
     def select_directory(self):
         """Select a directory for bulk analysis"""
+        from tkinter import filedialog
+        
         dir_path = filedialog.askdirectory(title="Select Directory")
         if dir_path:
             self.selected_file.set(f"Directory: {dir_path}")
@@ -710,49 +1420,65 @@ class ModernBugPredictionGUI:
             else:
                 results = {"error": "No code or file selected for analysis"}
                 
+            # Wait for history writes here rather than on the Tk thread
+            self.flush_history()
+            
             # Update UI in main thread
-            self.root.after(0, self.display_results, results)
+            self._ui_q.put((self.display_results, (results,)))
             
         except Exception as e:
             error_result = {"error": f"Analysis failed: {str(e)}"}
-            self.root.after(0, self.display_results, error_result)
+            self._ui_q.put((self.display_results, (error_result,)))
             
     def analyze_direct_code(self, code_content):
         """Analyze code content directly"""
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix=f'.{self.selected_language.get()}', 
-                                           delete=False, encoding='utf-8') as temp_file:
-                temp_file.write(code_content)
-                temp_file_path = temp_file.name
-                
-            # Run analysis on temporary file
-            results = self.analyze_file(temp_file_path)
-            
-            # Clean up
-            os.unlink(temp_file_path)
+            # Built-in patterns scan the text in memory
+            pattern_results = self._scanner.scan(self.DIRECT_INPUT_NAME, code_content)
             
-            return results
+            semgrep_results = []
+            if self.enable_semgrep.get() and self.semgrep_analyzer.check_semgrep_installation():
+                # Semgrep only reads files, so it still gets a temporary copy
+                with tempfile.NamedTemporaryFile(mode='w', suffix=f'.{self.selected_language.get()}', 
+                                               delete=False, encoding='utf-8') as temp_file:
+                    temp_file.write(code_content)
+                    temp_file_path = temp_file.name
+                try:
+                    semgrep_results = [dict(v, file=self.DIRECT_INPUT_NAME)
+                                       for v in self.run_semgrep_analysis(temp_file_path)]
+                finally:
+                    os.unlink(temp_file_path)
+                    
+            return self.analyze_file(self.DIRECT_INPUT_NAME, semgrep_results, pattern_results)
             
         except Exception as e:
             return {"error": f"Failed to analyze code: {str(e)}"}
             
-    def analyze_file(self, file_path):
-        """Analyze a single file"""
+    def analyze_file(self, file_path, semgrep_results=None, pattern_results=None, save=True):
+        """Analyze a single file, reusing findings already computed for it
+        
+        semgrep_results and pattern_results come from a directory scan's
+        batch Semgrep run and worker processes respectively. With save=False
+        the caller is responsible for storing the result.
+        """
         try:
             # Built-in vulnerability patterns
-            vulnerabilities = self.detect_vulnerabilities(file_path)
+            if pattern_results is None:
+                pattern_results = self.detect_vulnerabilities(file_path)
+            vulnerabilities = pattern_results
             
             # Add Semgrep analysis if enabled
-            if self.enable_semgrep.get():
-                semgrep_results = self.run_semgrep_analysis(file_path)
+            if self.enable_semgrep.get() and self.semgrep_analyzer.check_semgrep_installation():
+                if semgrep_results is None:
+                    semgrep_results = self.run_semgrep_analysis(file_path)
                 vulnerabilities.extend(semgrep_results)
                 
             # Categorize by severity
             categorized = self.categorize_vulnerabilities(vulnerabilities)
             
             # Save to database
-            self.save_analysis_result(file_path, categorized, vulnerabilities)
+            if save:
+                self.save_analysis_result(file_path, categorized, vulnerabilities)
             
             return {
                 "file": file_path,
@@ -765,24 +1491,68 @@ class ModernBugPredictionGUI:
             return {"error": f"Failed to analyze file {file_path}: {str(e)}"}
             
     def analyze_directory(self, dir_path):
-        """Analyze all files in a directory"""
-        results = []
-        supported_extensions = {'.py', '.js', '.java', '.c', '.cpp', '.php', '.rb', '.go', '.rs'}
+        """Analyze all files in a directory
+        
+        Full findings go straight to history; only running totals and the
+        DIRECTORY_TOP_FILES files with the most findings are kept for display.
+        """
+        files_analyzed = files_with_findings = total_vulnerabilities = 0
+        severity_counts = Counter()
+        top_files = []  # min-heap of (total, -order, trimmed result)
+        pending = []
         
         try:
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if Path(file_path).suffix.lower() in supported_extensions:
-                        file_result = self.analyze_file(file_path)
-                        if "error" not in file_result:
-                            results.append(file_result)
-                            
+            file_paths = list(iter_source_files(dir_path))
+            
+            # Built-in patterns first: hashing and scanning share one read of
+            # each file, and the findings land in file_cache for the merge below
+            content_hashes = self.hash_and_scan_files(file_paths)
+            
+            semgrep_by_path = {}
+            if self.enable_semgrep.get() and self.semgrep_analyzer.check_semgrep_installation():
+                semgrep_by_path = self.run_semgrep_batches(file_paths, content_hashes)
+                
+            # Semgrep has already run for every file (or is off); an empty list
+            # keeps analyze_file from starting a per-file process if the
+            # checkbox is toggled mid-scan. Pattern findings come back from
+            # file_cache once the writer has committed them.
+            self.flush_history()
+            pattern_results = self.scan_files_cached(file_paths, content_hashes)
+            for order, (file_path, findings) in enumerate(pattern_results):
+                file_result = self.analyze_file(
+                    file_path, semgrep_by_path.pop(file_path, []), findings, save=False)
+                if "error" in file_result:
+                    continue
+                    
+                files_analyzed += 1
+                total_vulnerabilities += file_result["total"]
+                severity_counts.update(file_result["summary"])
+                
+                # History rows are written in batches as the scan goes
+                pending.append(file_result)
+                if len(pending) >= self.WRITER_BATCH_ROWS:
+                    self.save_analysis_results(pending)
+                    pending = []
+                    
+                if file_result["total"]:
+                    files_with_findings += 1
+                    # The results view previews three findings per file
+                    entry = (file_result["total"], -order,
+                             dict(file_result, vulnerabilities=file_result["vulnerabilities"][:3]))
+                    if len(top_files) < self.DIRECTORY_TOP_FILES:
+                        heapq.heappush(top_files, entry)
+                    else:
+                        heapq.heappushpop(top_files, entry)
+                        
+            self.save_analysis_results(pending)
+            
             return {
                 "directory": dir_path,
-                "files_analyzed": len(results),
-                "results": results,
-                "total_vulnerabilities": sum(r.get("total", 0) for r in results)
+                "files_analyzed": files_analyzed,
+                "files_with_findings": files_with_findings,
+                "severity_counts": dict(severity_counts),
+                "results": [entry[2] for entry in sorted(top_files, reverse=True)],
+                "total_vulnerabilities": total_vulnerabilities
             }
             
         except Exception as e:
@@ -790,152 +1560,369 @@ class ModernBugPredictionGUI:
             
     def detect_vulnerabilities(self, file_path):
         """Detect vulnerabilities using built-in patterns"""
-        vulnerabilities = []
+        return self._scanner.scan(file_path)
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                lines = content.split('\n')
+    def _read_ahead(self, file_paths, load=read_source):
+        """Yield (path, load(path)) pairs in order, loading upcoming files on threads
+        
+        At most READ_AHEAD_FILES files are in flight, so reads overlap
+        scanning without holding a whole directory in memory. The value is
+        None when a read failed; scanning the file again reports the error.
+        """
+        # Plain threads rather than io_uring: there is no stdlib binding, and
+        # a few reader threads already keep ahead of the regex scan on
+        # small source files
+        from concurrent.futures import ThreadPoolExecutor
+        
+        paths = iter(file_paths)
+        with ThreadPoolExecutor(max_workers=self.READ_THREADS) as executor:
+            pending = deque((path, executor.submit(load, path))
+                            for path in islice(paths, self.READ_AHEAD_FILES))
+            while pending:
+                path, future = pending.popleft()
+                for next_path in islice(paths, 1):
+                    pending.append((next_path, executor.submit(load, next_path)))
+                try:
+                    content = future.result()
+                except OSError:
+                    content = None
+                yield path, content
                 
-            # Vulnerability patterns
-            patterns = {
-                'SQL Injection': [
-                    (r'(?i)(SELECT|INSERT|UPDATE|DELETE).*\+.*', 'String concatenation in SQL query'),
-                    (r'(?i)1\s*OR\s*1\s*=\s*1', 'Classic SQL injection pattern'),
-                    (r'(?i)UNION\s+SELECT', 'UNION-based SQL injection'),
-                    (r'(?i);\s*DROP\s+TABLE', 'SQL injection with DROP statement'),
-                ],
-                'Cross-Site Scripting (XSS)': [
-                    (r'innerHTML\s*=\s*[^;]*\+', 'Unsafe innerHTML assignment'),
-                    (r'document\.write\s*\([^)]*\+', 'Unsafe document.write usage'),
-                    (r'<script[^>]*>[^<]*</script>', 'Inline script tag'),
-                ],
-                'Command Injection': [
-                    (r'os\.system\s*\([^)]*\+', 'Command injection via os.system'),
-                    (r'subprocess\.[^(]*\([^)]*shell\s*=\s*True', 'Shell injection risk'),
-                    (r'eval\s*\([^)]*input', 'Code injection via eval'),
-                ],
-                'Path Traversal': [
-                    (r'\.\./', 'Directory traversal pattern'),
-                    (r'open\s*\([^)]*\+[^)]*["\'][^"\']*["\']', 'Unsafe file path construction'),
-                ],
-                'Hardcoded Credentials': [
-                    (r'(?i)(password|pwd|pass)\s*=\s*["\'][^"\']{3,}["\']', 'Hardcoded password'),
-                    (r'(?i)(api_key|apikey|secret)\s*=\s*["\'][^"\']{10,}["\']', 'Hardcoded API key'),
-                ],
-                'Weak Cryptography': [
-                    (r'hashlib\.md5\s*\(', 'Weak MD5 hash usage'),
-                    (r'hashlib\.sha1\s*\(', 'Weak SHA1 hash usage'),
-                    (r'(?i)DES|RC4', 'Weak encryption algorithm'),
-                ],
-                'Unsafe Deserialization': [
-                    (r'pickle\.loads?\s*\(', 'Unsafe pickle deserialization'),
-                    (r'yaml\.load\s*\([^)]*Loader', 'Unsafe YAML loading'),
-                ],
-                'Information Disclosure': [
-                    (r'(?i)debug\s*=\s*True', 'Debug mode enabled'),
-                    (r'print\s*\([^)]*password', 'Password in debug output'),
-                    (r'console\.log\s*\([^)]*token', 'Token in console output'),
-                ]
-            }
+    def scan_files(self, file_paths):
+        """Yield built-in pattern findings for each path, in order
+        
+        Large directories are spread over one worker process per core;
+        below PARALLEL_SCAN_MIN_FILES process start-up would cost more
+        than it saves.
+        """
+        if not self._use_worker_processes(file_paths):
+            for file_path, content in self._read_ahead(file_paths):
+                yield self._scanner.scan(file_path, content)
+            return
             
-            # Scan for patterns
-            for vuln_type, pattern_list in patterns.items():
-                for pattern, description in pattern_list:
-                    for line_num, line in enumerate(lines, 1):
-                        if re.search(pattern, line):
-                            severity = self.get_severity(vuln_type)
-                            vulnerabilities.append({
-                                'type': vuln_type,
-                                'description': description,
-                                'line': line_num,
-                                'code': line.strip(),
-                                'severity': severity,
-                                'file': file_path
-                            })
-                            
-        except Exception as e:
-            print(f"Error detecting vulnerabilities: {e}")
+        with self._scan_worker_pool(file_paths) as executor:
+            yield from executor.map(_scan_in_worker, file_paths, chunksize=self.PARALLEL_SCAN_CHUNK)
             
-        return vulnerabilities
+    def _hash_and_scan(self, file_paths):
+        """Yield (path, digest, findings) for each path, in order
         
+        Each file is read once, for its digest and its text; the text is only
+        scanned when file_cache has no findings for that content yet, else
+        findings is None. digest is None for unreadable files.
+        """
+        if self._use_worker_processes(file_paths):
+            with self._scan_worker_pool(file_paths, cache_db=self._db_path) as executor:
+                results = executor.map(_hash_and_scan_in_worker, file_paths,
+                                       chunksize=self.PARALLEL_SCAN_CHUNK)
+                for file_path, (digest, findings) in zip(file_paths, results):
+                    yield file_path, digest, findings
+            return
+            
+        patterns_hash = self._scanner.fingerprint
+        for file_path, loaded in self._read_ahead(file_paths, read_and_hash):
+            if loaded is None:
+                yield file_path, None, self._scanner.scan(file_path)
+                continue
+            digest, content = loaded
+            try:
+                cached = self.conn.execute(_FILE_CACHE_HIT_SQL, (digest, patterns_hash)).fetchone()
+            except sqlite3.Error:
+                cached = None
+            yield file_path, digest, None if cached else self._scanner.scan(file_path, content)
+            
+    def _use_worker_processes(self, file_paths):
+        """Whether a pattern scan of file_paths should use worker processes"""
+        workers = min(os.cpu_count() or 1, -(-len(file_paths) // self.PARALLEL_SCAN_CHUNK))
+        return len(file_paths) >= self.PARALLEL_SCAN_MIN_FILES and workers >= 2
+        
+    def _scan_worker_pool(self, file_paths, cache_db=None):
+        """Start one pattern-scan worker process per core, up to what file_paths needs"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # spawn rather than fork: this process already runs Tk and the
+        # database writer thread
+        return ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, -(-len(file_paths) // self.PARALLEL_SCAN_CHUNK)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_scan_worker,
+            initargs=(self.VULNERABILITY_PATTERNS, self._severity_map, cache_db))
+            
     def get_severity(self, vuln_type):
         """Get severity level for vulnerability type"""
-        critical_types = ['SQL Injection', 'Command Injection', 'Unsafe Deserialization', 'Hardcoded Credentials']
-        high_types = ['Cross-Site Scripting (XSS)', 'Path Traversal']
-        medium_types = ['Weak Cryptography', 'Information Disclosure']
-        
-        if vuln_type in critical_types:
-            return 'CRITICAL'
-        elif vuln_type in high_types:
-            return 'HIGH'
-        elif vuln_type in medium_types:
-            return 'MEDIUM'
-        else:
-            return 'LOW'
+        return self.VULNERABILITY_SEVERITIES.get(vuln_type, 'LOW')
             
     def run_semgrep_analysis(self, file_path):
         """Run Semgrep analysis if available"""
+        semgrep_vulns = []
         try:
-            cmd = ['semgrep', '--config=auto', '--json', '--quiet', file_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, 
-                                  encoding='utf-8', errors='replace', timeout=30)
+            cmd = ['semgrep', f'--config={SemgrepAnalyzer.CONFIG}', '--json', '--quiet', file_path]
             
-            if result.returncode == 0:
-                findings = json.loads(result.stdout)
-                semgrep_vulns = []
+            for finding in stream_semgrep_results(cmd, timeout=30):
+                semgrep_vulns.append(self.semgrep_vulnerability(finding, file_path))
+                self._ui_q.put((self.analysis_status.set,
+                                (f"Analyzing... {len(semgrep_vulns)} Semgrep findings",)))
                 
-                for finding in findings.get('results', []):
-                    semgrep_vulns.append({
-                        'type': finding.get('check_id', 'Unknown'),
-                        'description': finding.get('extra', {}).get('message', 'Semgrep finding'),
-                        'line': finding.get('start', {}).get('line', 0),
-                        'code': finding.get('extra', {}).get('lines', ''),
-                        'severity': finding.get('extra', {}).get('severity', 'INFO').upper(),
-                        'file': file_path,
-                        'source': 'Semgrep'
-                    })
-                    
-                return semgrep_vulns
+            return semgrep_vulns
                 
         except Exception as e:
             print(f"Semgrep analysis failed: {e}")
             
         return []
         
-    def categorize_vulnerabilities(self, vulnerabilities):
-        """Categorize vulnerabilities by severity"""
-        categories = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0, 'INFO': 0}
+    def hash_and_scan_files(self, file_paths):
+        """Map each readable path to a digest of its content
         
-        for vuln in vulnerabilities:
-            severity = vuln.get('severity', 'INFO')
-            if severity in categories:
-                categories[severity] += 1
+        Content without findings in file_cache yet is scanned on the same
+        read and its findings queued for the cache, so scan_files_cached can
+        serve every file once the writer has committed.
+        """
+        patterns_hash = self._scanner.fingerprint
+        content_hashes = {}
+        cache_rows = []
+        for path, digest, findings in self._hash_and_scan(file_paths):
+            if digest is None:
+                continue
+            content_hashes[path] = digest
+            if findings is not None:
+                cache_rows.append((digest, patterns_hash, compress_results(findings)))
+                if len(cache_rows) >= self.WRITER_BATCH_ROWS:
+                    self._write_q.put((_FILE_CACHE_INSERT_SQL, cache_rows))
+                    cache_rows = []
+                    
+        if cache_rows:
+            self._write_q.put((_FILE_CACHE_INSERT_SQL, cache_rows))
+        return content_hashes
+        
+    def scan_files_cached(self, file_paths, content_hashes):
+        """Yield (path, findings) for the built-in patterns, in path order
+        
+        Content seen before is served from file_cache, still compressed
+        until its turn comes; only new content is scanned.
+        """
+        patterns_hash = self._scanner.fingerprint
+        cached = self._load_cached(
+            'SELECT content_hash, findings_blob FROM file_cache '
+            'WHERE patterns_hash = ? AND content_hash IN ({})',
+            (patterns_hash,), set(content_hashes.values()))
+        
+        misses = [path for path in file_paths if content_hashes.get(path) not in cached]
+        scanned = self.scan_files(misses)
+        
+        cache_rows = []
+        for path in file_paths:
+            blob = cached.get(content_hashes.get(path))
+            if blob is not None:
+                # Identical content may live at another path
+                yield path, [dict(v, file=path) for v in decompress_results(blob)]
+                continue
                 
-        return categories
+            findings = next(scanned)
+            if path in content_hashes:
+                cache_rows.append((content_hashes[path], patterns_hash, compress_results(findings)))
+                if len(cache_rows) >= self.WRITER_BATCH_ROWS:
+                    self._write_q.put((_FILE_CACHE_INSERT_SQL, cache_rows))
+                    cache_rows = []
+            yield path, findings
+            
+        if cache_rows:
+            self._write_q.put((_FILE_CACHE_INSERT_SQL, cache_rows))
+        
+    def run_semgrep_batches(self, file_paths, content_hashes):
+        """Run Semgrep over many files as parallel single-job batches
+        
+        Files whose content already has cached findings are not rescanned.
+        Returns a dict mapping each path to its findings.
+        """
+        # concurrent.futures drags in logging; only directory scans need it
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        
+        findings_by_path = {path: [] for path in file_paths}
+        stamp = self.semgrep_analyzer.cache_stamp
+        cached = self.cached_findings(set(content_hashes.values()), stamp)
+        
+        misses = []
+        for path in file_paths:
+            raw_findings = cached.get((content_hashes.get(path), os.path.splitext(path)[1]))
+            if raw_findings is None:
+                misses.append(path)
+            else:
+                findings_by_path[path] = [self.semgrep_vulnerability(f, path) for f in raw_findings]
+        if not misses:
+            return findings_by_path
+            
+        # Enough batches to keep every core busy, but no more than
+        # SEMGREP_BATCH_FILES each so start-up cost stays amortized
+        workers = os.cpu_count() or 1
+        batch_size = min(self.SEMGREP_BATCH_FILES, -(-len(misses) // workers))
+        batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+        
+        # Each worker only waits on its semgrep process, so threads suffice
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            futures = {executor.submit(self.semgrep_analyzer.scan_batch, batch): batch for batch in batches}
+            for done, future in enumerate(as_completed(futures), 1):
+                raw_by_path = {path: [] for path in futures[future]}
+                # Semgrep rewrites the paths it reports; map them back to the
+                # requested ones
+                requested = {path_key(path): path for path in futures[future]}
+                unmatched = False
+                for finding in future.result() or []:
+                    path = requested.get(path_key(finding.get('path', '')))
+                    if path is None:
+                        unmatched = True
+                        continue
+                    raw_by_path[path].append(finding)
+                    findings_by_path[path].append(self.semgrep_vulnerability(finding, path))
+                    
+                # Only a successful run may populate the cache, and a file is
+                # only cached as clean when no finding went to an unknown path
+                if future.result() is not None:
+                    self._write_q.put((_CACHE_INSERT_SQL, [
+                        (content_hashes[path], os.path.splitext(path)[1], stamp,
+                         compress_results(raw_by_path[path]))
+                        for path in futures[future]
+                        if path in content_hashes and (raw_by_path[path] or not unmatched)
+                    ]))
+                            
+                self._ui_q.put((self.analysis_status.set,
+                                (f"Analyzing... {done}/{len(batches)} Semgrep batches",)))
+                
+        return findings_by_path
+        
+    def cached_findings(self, content_hashes, stamp):
+        """Look up raw Semgrep findings cached for the given content hashes
+        
+        Only entries made under stamp count. Returns a dict keyed by
+        (content_hash, file extension).
+        """
+        rows = self._load_cached(
+            'SELECT content_hash, file_ext, findings_blob FROM finding_cache '
+            'WHERE semgrep_stamp = ? AND content_hash IN ({})', (stamp,), content_hashes)
+        return {key: decompress_results(blob) for key, blob in rows.items()}
+        
+    def _load_cached(self, query, params, content_hashes):
+        """Run a cache query over content_hashes, returning each findings blob
+        
+        query has one '{}' slot for the IN list; params bind before it. The
+        blob is the last column; the ones before it form the key.
+        """
+        cached = {}
+        content_hashes = list(content_hashes)
+        try:
+            # Fixed-size chunks keep the statement text, and so its cached
+            # prepared form, the same; they also stay under the parameter limit
+            for i in range(0, len(content_hashes), 500):
+                chunk = content_hashes[i:i + 500]
+                rows = self.conn.execute(
+                    query.format(",".join("?" * len(chunk))), (*params, *chunk))
+                for *key, blob in rows:
+                    cached[key[0] if len(key) == 1 else tuple(key)] = blob
+        except Exception as e:
+            print(f"Finding cache error: {e}")
+        return cached
+        
+    def semgrep_vulnerability(self, finding, file_path):
+        """Convert a raw Semgrep finding into the GUI's vulnerability dict"""
+        return {
+            'type': finding.get('check_id', 'Unknown'),
+            'description': finding.get('extra', {}).get('message', 'Semgrep finding'),
+            'line': finding.get('start', {}).get('line', 0),
+            'code': finding.get('extra', {}).get('lines', ''),
+            'severity': finding.get('extra', {}).get('severity', 'INFO').upper(),
+            'file': file_path,
+            'source': 'Semgrep'
+        }
+        
+    def categorize_vulnerabilities(self, vulnerabilities):
+        """Categorize vulnerabilities by severity"""
+        counts = Counter(vuln.get('severity', 'INFO') for vuln in vulnerabilities)
+        # Fixed keys and order; severities outside them are not counted
+        return {level: counts[level] for level in ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW', 'INFO')}
         
     def save_analysis_result(self, filename, summary, vulnerabilities):
-        """Save analysis result to database"""
+        """Queue an analysis result for the database writer thread"""
         try:
-            timestamp = datetime.now().isoformat()
-            total_vulns = sum(summary.values())
-            
-            self.cursor.execute('''
-                INSERT INTO analysis_results 
-                (timestamp, filename, language, total_vulnerabilities, 
-                 critical_count, high_count, medium_count, low_count, info_count, results_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                timestamp, filename, self.selected_language.get(), total_vulns,
-                summary.get('CRITICAL', 0), summary.get('HIGH', 0), 
-                summary.get('MEDIUM', 0), summary.get('LOW', 0), 
-                summary.get('INFO', 0), json.dumps(vulnerabilities)
-            ))
-            self.conn.commit()
+            self._write_q.put((_INSERT_SQL, [self._result_row(filename, summary, vulnerabilities)]))
+        except Exception as e:
+            print(f"Database save error: {e}")
             
+    def save_analysis_results(self, results):
+        """Queue many file results to be committed in a single transaction"""
+        try:
+            rows = [self._result_row(r["file"], r["summary"], r["vulnerabilities"]) for r in results]
+            if rows:
+                self._write_q.put((_INSERT_SQL, rows))
         except Exception as e:
             print(f"Database save error: {e}")
             
+    def _result_row(self, filename, summary, vulnerabilities):
+        """Build the analysis_results row for one file"""
+        timestamp = datetime.now().isoformat()
+        total_vulns = sum(summary.values())
+        # Highest severity present, so history can be filtered by an index
+        max_rank = findings_max_rank(vulnerabilities)
+        
+        return (
+            timestamp, filename, self.selected_language.get(), total_vulns,
+            summary.get('CRITICAL', 0), summary.get('HIGH', 0), 
+            summary.get('MEDIUM', 0), summary.get('LOW', 0), 
+            summary.get('INFO', 0), compress_results(vulnerabilities), max_rank
+        )
+            
+    def _db_writer_loop(self):
+        """Commit queued (sql, rows) writes in batches, one transaction each"""
+        while True:
+            rows = [self._write_q.get()]
+            deadline = time.monotonic() + 0.1
+            try:
+                while len(rows) < self.WRITER_BATCH_ROWS:
+                    rows.append(self._write_q.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+            
+            # One executemany per distinct statement in the batch
+            statements = {}
+            for sql, params in rows:
+                statements.setdefault(sql, []).extend(params)
+                
+            try:
+                self.conn.execute('BEGIN IMMEDIATE')
+                for sql, params in statements.items():
+                    self.conn.executemany(sql, params)
+                self.conn.execute('COMMIT')
+            except Exception as e:
+                print(f"Database save error: {e}")
+                if self.conn.in_transaction:
+                    self.conn.execute('ROLLBACK')
+            else:
+                # Have the Tk thread re-read history now the rows are visible;
+                # one pending refresh covers any number of commits
+                if _INSERT_SQL in statements and not self._history_refresh_pending:
+                    self._history_refresh_pending = True
+                    self._ui_q.put((self._refresh_committed_history, ()))
+            finally:
+                for _ in rows:
+                    self._write_q.task_done()
+                    
+    def flush_history(self):
+        """Wait until the writer thread has committed every queued result
+        
+        Blocks; on the Tk thread use after_history_flush instead.
+        """
+        if self._writer_thread is not None:
+            self._write_q.join()
+            
+    def after_history_flush(self, callback, *args):
+        """Run callback(*args) on the Tk thread once queued results are committed
+        
+        The wait happens on a helper thread, so the UI keeps running.
+        """
+        def wait():
+            self.flush_history()
+            self._ui_q.put((callback, args))
+            
+        threading.Thread(target=wait, daemon=True).start()
+            
     def display_results(self, results):
         """Display analysis results in the UI"""
         # Stop progress bar and re-enable button
@@ -945,6 +1932,7 @@ class ModernBugPredictionGUI:
         self.status_label.config(style='Success.TLabel')
         
         # Clear previous results
+        self._cancel_render()
         self.results_text.config(state='normal')
         self.results_text.delete(1.0, tk.END)
         
@@ -959,8 +1947,8 @@ class ModernBugPredictionGUI:
                 
         self.results_text.config(state='disabled')
         
-        # Update dashboard statistics
-        self.update_dashboard_stats()
+        # Update dashboard statistics once the writer has committed this run
+        self.after_history_flush(self.update_dashboard_stats)
         
     def display_file_results(self, results):
         """Display results for single file analysis"""
@@ -968,42 +1956,35 @@ class ModernBugPredictionGUI:
         total_vulns = results.get('total', 0)
         
         # Header
-        self.results_text.insert(tk.END, f"🔍 Analysis Results for: {file_name}\n", 'header')
-        self.results_text.insert(tk.END, "=" * 60 + "\n\n", 'header')
+        out = [
+            (f"🔍 Analysis Results for: {file_name}\n", 'header'),
+            ("=" * 60 + "\n\n", 'header'),
+        ]
         
         # Summary
         summary = results.get('summary', {})
-        self.results_text.insert(tk.END, f"📊 Summary:\n", 'header')
-        self.results_text.insert(tk.END, f"  Total Vulnerabilities: {total_vulns}\n")
+        out.append((f"📊 Summary:\n", 'header'))
+        out.append((f"  Total Vulnerabilities: {total_vulns}\n", None))
         
         for severity, count in summary.items():
             if count > 0:
-                tag = severity.lower()
-                self.results_text.insert(tk.END, f"  {severity}: {count}\n", tag)
+                tag = SEVERITY_TAGS[SEVERITY_RANKS.get(severity, 0)]
+                out.append((f"  {severity}: {count}\n", tag))
                 
-        self.results_text.insert(tk.END, "\n")
+        out.append(("\n", None))
         
         # Detailed findings
         vulnerabilities = results.get('vulnerabilities', [])
         if vulnerabilities:
-            self.results_text.insert(tk.END, "🔍 Detailed Findings:\n", 'header')
-            self.results_text.insert(tk.END, "-" * 40 + "\n\n")
+            out.append(("🔍 Detailed Findings:\n", 'header'))
+            out.append(("-" * 40 + "\n\n", None))
+            self._insert_segments(out)
             
-            for i, vuln in enumerate(vulnerabilities, 1):
-                severity = vuln.get('severity', 'INFO')
-                tag = severity.lower()
-                
-                self.results_text.insert(tk.END, f"{i}. ", 'header')
-                self.results_text.insert(tk.END, f"[{severity}] ", tag)
-                self.results_text.insert(tk.END, f"{vuln.get('type', 'Unknown')}\n")
-                self.results_text.insert(tk.END, f"   Description: {vuln.get('description', 'No description')}\n")
-                self.results_text.insert(tk.END, f"   Line: {vuln.get('line', 'Unknown')}\n")
-                self.results_text.insert(tk.END, f"   Code: {vuln.get('code', 'No code snippet')}\n")
-                if vuln.get('source'):
-                    self.results_text.insert(tk.END, f"   Source: {vuln.get('source')}\n")
-                self.results_text.insert(tk.END, "\n")
+            self._results_backlog = self._finding_blocks(vulnerabilities)
+            self._render_more_results()
         else:
-            self.results_text.insert(tk.END, "✅ No vulnerabilities detected!\n", 'info')
+            out.append(("✅ No vulnerabilities detected!\n", 'info'))
+            self._insert_segments(out)
             
     def display_directory_results(self, results):
         """Display results for directory analysis"""
@@ -1012,60 +1993,142 @@ class ModernBugPredictionGUI:
         total_vulns = results.get('total_vulnerabilities', 0)
         
         # Header
-        self.results_text.insert(tk.END, f"📂 Directory Analysis: {dir_name}\n", 'header')
-        self.results_text.insert(tk.END, "=" * 60 + "\n\n", 'header')
+        out = [
+            (f"📂 Directory Analysis: {dir_name}\n", 'header'),
+            ("=" * 60 + "\n\n", 'header'),
+        ]
         
         # Summary
-        self.results_text.insert(tk.END, f"📊 Summary:\n", 'header')
-        self.results_text.insert(tk.END, f"  Files Analyzed: {files_analyzed}\n")
-        self.results_text.insert(tk.END, f"  Total Vulnerabilities: {total_vulns}\n\n")
+        out.append((f"📊 Summary:\n", 'header'))
+        out.append((f"  Files Analyzed: {files_analyzed}\n", None))
+        out.append((f"  Total Vulnerabilities: {total_vulns}\n", None))
         
-        # Per-file results
+        for severity, count in results.get('severity_counts', {}).items():
+            if count > 0:
+                tag = SEVERITY_TAGS[SEVERITY_RANKS.get(severity, 0)]
+                out.append((f"  {severity}: {count}\n", tag))
+                
+        out.append(("\n", None))
+        
+        # Per-file results, most findings first
         file_results = results.get('results', [])
         if file_results:
-            self.results_text.insert(tk.END, "📋 Per-File Results:\n", 'header')
-            self.results_text.insert(tk.END, "-" * 40 + "\n\n")
+            with_findings = results.get('files_with_findings', len(file_results))
+            if with_findings > len(file_results):
+                out.append((f"📋 Top {len(file_results)} of {with_findings} Files With Findings "
+                            "(full details are in History):\n", 'header'))
+            else:
+                out.append(("📋 Per-File Results:\n", 'header'))
+            out.append(("-" * 40 + "\n\n", None))
+            self._insert_segments(out)
             
-            for file_result in file_results:
-                file_name = os.path.basename(file_result.get('file', 'Unknown'))
-                file_vulns = file_result.get('total', 0)
-                
-                if file_vulns > 0:
-                    self.results_text.insert(tk.END, f"📄 {file_name}: ", 'header')
-                    self.results_text.insert(tk.END, f"{file_vulns} vulnerabilities\n", 'warning')
-                    
-                    # Show top vulnerabilities for this file
-                    vulns = file_result.get('vulnerabilities', [])[:3]  # Show top 3
-                    for vuln in vulns:
-                        severity = vuln.get('severity', 'INFO')
-                        tag = severity.lower()
-                        self.results_text.insert(tk.END, f"    • ", 'content')
-                        self.results_text.insert(tk.END, f"[{severity}] ", tag)
-                        self.results_text.insert(tk.END, f"{vuln.get('type', 'Unknown')}\n")
-                    
-                    if len(file_result.get('vulnerabilities', [])) > 3:
-                        remaining = len(file_result.get('vulnerabilities', [])) - 3
-                        self.results_text.insert(tk.END, f"    ... and {remaining} more\n")
-                    self.results_text.insert(tk.END, "\n")
+            self._results_backlog = self._file_result_blocks(file_results)
+            self._render_more_results()
         else:
-            self.results_text.insert(tk.END, "✅ No vulnerabilities detected in any files!\n", 'info')
+            out.append(("✅ No vulnerabilities detected in any files!\n", 'info'))
+            self._insert_segments(out)
+            
+    def _insert_segments(self, segments):
+        """Append (text, tag) pairs to the results view in a single Tk call
+        
+        Tags travel inline with the text, so there is no follow-up tag_add
+        pass and no '1.0+Nc' index arithmetic for Tk to parse.
+        """
+        args = []
+        for text, tag in segments:
+            args += (text, tag or ())
+        if args:
+            self.results_text.insert(tk.END, *args)
+            
+    def _finding_blocks(self, vulnerabilities):
+        """Yield the (text, tag) segments of each detailed finding"""
+        for i, vuln in enumerate(vulnerabilities, 1):
+            severity = vuln.get('severity', 'INFO')
+            tag = SEVERITY_TAGS[SEVERITY_RANKS.get(severity, 0)]
+            
+            block = [
+                (f"{i}. ", 'header'),
+                (f"[{severity}] ", tag),
+                (f"{vuln.get('type', 'Unknown')}\n"
+                 f"   Description: {vuln.get('description', 'No description')}\n"
+                 f"   Line: {vuln.get('line', 'Unknown')}\n"
+                 f"   Code: {vuln.get('code', 'No code snippet')}\n", None),
+            ]
+            if vuln.get('source'):
+                block.append((f"   Source: {vuln.get('source')}\n", None))
+            block.append(("\n", None))
+            yield block
+            
+    def _file_result_blocks(self, file_results):
+        """Yield the (text, tag) segments of each file's summary"""
+        for file_result in file_results:
+            file_name = os.path.basename(file_result.get('file', 'Unknown'))
+            file_vulns = file_result.get('total', 0)
+            
+            if file_vulns > 0:
+                block = [
+                    (f"📄 {file_name}: ", 'header'),
+                    (f"{file_vulns} vulnerabilities\n", 'warning'),
+                ]
+                
+                # Show top vulnerabilities for this file
+                vulns = file_result.get('vulnerabilities', [])[:3]  # Show top 3
+                for vuln in vulns:
+                    severity = vuln.get('severity', 'INFO')
+                    tag = SEVERITY_TAGS[SEVERITY_RANKS.get(severity, 0)]
+                    block.append((f"    • ", 'content'))
+                    block.append((f"[{severity}] ", tag))
+                    block.append((f"{vuln.get('type', 'Unknown')}\n", None))
+                
+                if file_vulns > len(vulns):
+                    block.append((f"    ... and {file_vulns - len(vulns)} more\n", None))
+                block.append(("\n", None))
+                yield block
+                
+    def _render_more_results(self, budget=None):
+        """Render the next page of queued result blocks
+        
+        Each call inserts at most RESULTS_BATCH_ITEMS blocks and reschedules
+        itself on an idle tick until budget blocks (a page by default) are
+        shown, so input and redraws are handled between batches.
+        """
+        self._render_after = None
+        if self._results_backlog is None:
+            return
+        if budget is None:
+            budget = self.RESULTS_PAGE_ITEMS
+        count = min(budget, self.RESULTS_BATCH_ITEMS)
+        blocks = list(islice(self._results_backlog, count))
+        if len(blocks) < count:
+            self._results_backlog = None
+        self.results_text.config(state='normal')
+        self._insert_segments([segment for block in blocks for segment in block])
+        self.results_text.config(state='disabled')
+        
+        if self._results_backlog is not None and budget > count:
+            self._render_after = self.root.after_idle(self._render_more_results, budget - count)
+            
+    def _cancel_render(self):
+        """Drop any queued result blocks and the idle tick rendering them"""
+        self._results_backlog = None
+        if self._render_after is not None:
+            self.root.after_cancel(self._render_after)
+            self._render_after = None
+            
+    def _on_results_yscroll(self, first, last):
+        """Update the scrollbar and queue another page when the end comes into view"""
+        self.results_text.vbar.set(first, last)
+        if self._results_backlog is not None and float(last) > 0.9 and self._render_after is None:
+            self._render_after = self.root.after_idle(self._render_more_results)
             
     def update_dashboard_stats(self):
         """Update dashboard statistics"""
         try:
-            # Get statistics from database
-            self.cursor.execute('SELECT COUNT(*) FROM analysis_results')
-            total_scans = self.cursor.fetchone()[0]
-            
-            self.cursor.execute('SELECT SUM(critical_count) FROM analysis_results')
-            critical_issues = self.cursor.fetchone()[0] or 0
+            # Get statistics from database in one pass over the table
+            self.cursor.execute(_DASHBOARD_STATS_SQL)
+            total_scans, critical_issues, files_analyzed, successful_scans = self.cursor.fetchone()
             
-            self.cursor.execute('SELECT COUNT(DISTINCT filename) FROM analysis_results')
-            files_analyzed = self.cursor.fetchone()[0]
-            
-            # Calculate success rate (scans with no critical issues)
-            self.cursor.execute('SELECT COUNT(*) FROM analysis_results WHERE critical_count = 0')
-            successful_scans = self.cursor.fetchone()[0]
+            # Success rate: scans with no critical issues
             success_rate = (successful_scans / total_scans * 100) if total_scans > 0 else 0
             
             # Update labels
@@ -1081,42 +2144,98 @@ class ModernBugPredictionGUI:
         except Exception as e:
             print(f"Error updating dashboard stats: {e}")
             
-    def refresh_history(self):
-        """Refresh the history display"""
+    def refresh_history(self, top=0):
+        """Refresh the history display from the rows committed so far
+        
+        Never waits on the writer thread; it queues a refresh after each commit.
+        """
         try:
-            # Clear existing items
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
-                
-            # Fetch recent analysis results
-            self.cursor.execute('''
-                SELECT timestamp, filename, language, total_vulnerabilities, 
-                       critical_count, high_count 
-                FROM analysis_results 
-                ORDER BY timestamp DESC 
-                LIMIT 100
-            ''')
+            self.cursor.execute(_HISTORY_COUNT_SQL, (self._history_min_rank(),))
+            self._history_total = self.cursor.fetchone()[0]
+            self._history_pages.clear()
+            self._show_history_window(top)
+            
+        except Exception as e:
+            print(f"Error refreshing history: {e}")
             
-            results = self.cursor.fetchall()
+    def _refresh_committed_history(self):
+        """Pick up newly committed rows, keeping the current scroll position"""
+        self._history_refresh_pending = False
+        self.refresh_history(self._history_top)
             
-            for result in results:
-                timestamp, filename, language, total_vulns, critical, high = result
+    def _history_min_rank(self):
+        """Severity rank a history row needs to pass the Min Severity filter"""
+        return SEVERITY_RANKS.get(self.min_severity.get(), 0)
+        
+    def _history_page(self, page):
+        """Fetch one page of formatted history rows, newest first"""
+        rows = self._history_pages.get(page)
+        if rows is None:
+            self.cursor.execute(_HISTORY_PAGE_SQL, (
+                self._history_min_rank(), self.HISTORY_PAGE_ROWS, page * self.HISTORY_PAGE_ROWS))
+            
+            rows = []
+            for timestamp, filename, language, total_vulns, critical, high in self.cursor.fetchall():
                 # Format timestamp
                 dt = datetime.fromisoformat(timestamp)
                 formatted_time = dt.strftime("%Y-%m-%d %H:%M")
                 # Get just filename without path
                 short_filename = os.path.basename(filename)
+                rows.append((formatted_time, short_filename, language, total_vulns, critical, high))
                 
-                self.history_tree.insert('', 'end', values=(
-                    formatted_time, short_filename, language, 
-                    total_vulns, critical, high
-                ))
+            if len(self._history_pages) >= self.HISTORY_CACHED_PAGES:
+                self._history_pages.clear()
+            self._history_pages[page] = rows
+        return rows
+        
+    def _show_history_window(self, top):
+        """Populate the history Treeview with just the rows in view"""
+        top = max(0, min(top, self._history_total - self._history_visible))
+        self._history_top = top
+        end = min(top + self._history_visible, self._history_total)
+        
+        children = self.history_tree.get_children()
+        if children:
+            self.history_tree.delete(*children)
+        for index in range(top, end):
+            page = self._history_page(index // self.HISTORY_PAGE_ROWS)
+            offset = index % self.HISTORY_PAGE_ROWS
+            if offset < len(page):
+                self.history_tree.insert('', 'end', values=page[offset])
                 
-        except Exception as e:
-            print(f"Error refreshing history: {e}")
+        if self._history_total:
+            self.history_scrollbar.set(top / self._history_total, end / self._history_total)
+        else:
+            self.history_scrollbar.set(0, 1)
+            
+    def _on_history_scroll(self, action, *args):
+        """Translate scrollbar commands into a new history window"""
+        if action == 'moveto':
+            top = int(float(args[0]) * self._history_total)
+        else:
+            step = self._history_visible if args[1] == 'pages' else 1
+            top = self._history_top + int(args[0]) * step
+        self._show_history_window(top)
+        
+    def _on_history_wheel(self, event):
+        """Scroll the history window with the mouse wheel"""
+        direction = -1 if event.num == 4 or event.delta > 0 else 1
+        self._show_history_window(self._history_top + 3 * direction)
+        return 'break'
+        
+    def _on_history_resize(self, event):
+        """Re-render when the number of rows that fit in the Treeview changes"""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        # One row's worth of space goes to the column headings
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._history_visible:
+            self._history_visible = visible
+            self._show_history_window(self._history_top)
             
     def export_results(self, format_type):
         """Export analysis results"""
+        from tkinter import filedialog, messagebox
+        
         try:
             # Get current results from the display
             current_text = self.results_text.get(1.0, tk.END)
@@ -1139,30 +2258,41 @@ class ModernBugPredictionGUI:
             )
             
             if file_path:
-                if format_type == 'json':
-                    self.export_json(file_path)
-                elif format_type == 'csv':
-                    self.export_csv(file_path)
-                elif format_type == 'html':
-                    self.export_html(file_path)
-                    
-                messagebox.showinfo("Export Complete", f"Results exported to {file_path}")
+                # Export only once queued results are in the database
+                self.after_history_flush(self._write_export, format_type, file_path)
                 
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export: {str(e)}")
             
+    def _write_export(self, format_type, file_path):
+        """Write an export chosen in export_results and report the outcome"""
+        from tkinter import messagebox
+        
+        try:
+            if format_type == 'json':
+                self.export_json(file_path)
+            elif format_type == 'csv':
+                self.export_csv(file_path)
+            elif format_type == 'html':
+                self.export_html(file_path)
+                
+            messagebox.showinfo("Export Complete", f"Results exported to {file_path}")
+            
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export: {str(e)}")
+            
     def export_json(self, file_path):
         """Export results as JSON"""
         # Get latest analysis from database
         self.cursor.execute('''
-            SELECT results_json FROM analysis_results 
+            SELECT results_json, results_blob FROM analysis_results 
             ORDER BY timestamp DESC LIMIT 1
         ''')
         result = self.cursor.fetchone()
         
         if result:
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(result[0])
+                f.write(results_json_text(*result))
         else:
             # Fallback to empty results
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -1191,78 +2321,31 @@ class ModernBugPredictionGUI:
         """Export results as HTML report"""
         # Get latest analysis
         self.cursor.execute('''
-            SELECT * FROM analysis_results 
+            SELECT timestamp, filename, language, total_vulnerabilities,
+                   critical_count, high_count, medium_count, low_count
+            FROM analysis_results 
             ORDER BY timestamp DESC LIMIT 1
         ''')
         result = self.cursor.fetchone()
         
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Bug Analysis Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-                .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; }}
-                .header {{ background: #2d2d2d; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
-                .stats {{ display: flex; gap: 20px; margin: 20px 0; }}
-                .stat-card {{ background: #f8f9fa; padding: 15px; border-radius: 8px; flex: 1; text-align: center; }}
-                .critical {{ color: #f44336; font-weight: bold; }}
-                .high {{ color: #ff9800; font-weight: bold; }}
-                .medium {{ color: #ffeb3b; font-weight: bold; }}
-                .low {{ color: #4caf50; font-weight: bold; }}
-                .info {{ color: #2196f3; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>🔍 Bug Analysis Report</h1>
-                    <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                </div>
-        """
-        
-        if result:
-            html_content += f"""
-                <div class="stats">
-                    <div class="stat-card">
-                        <h3>Total Vulnerabilities</h3>
-                        <h2>{result[4]}</h2>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Critical</h3>
-                        <h2 class="critical">{result[5]}</h2>
-                    </div>
-                    <div class="stat-card">
-                        <h3>High</h3>
-                        <h2 class="high">{result[6]}</h2>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Medium</h3>
-                        <h2 class="medium">{result[7]}</h2>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Low</h3>
-                        <h2 class="low">{result[8]}</h2>
-                    </div>
-                </div>
-                <h2>Analysis Details</h2>
-                <p><strong>File:</strong> {result[2]}</p>
-                <p><strong>Language:</strong> {result[3]}</p>
-                <p><strong>Timestamp:</strong> {result[1]}</p>
-            """
-        else:
-            html_content += "<p>No analysis results available.</p>"
-            
-        html_content += """
-            </div>
-        </body>
-        </html>
-        """
-        
+        # Written piece by piece; no intermediate copies of the document
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write(_HTML_REPORT_HEADER.format(
+                generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            if result:
+                timestamp, filename, language, total, critical, high, medium, low = result
+                f.write(_HTML_REPORT_STATS.format(
+                    total=total, critical=critical, high=high, medium=medium, low=low,
+                    filename=filename, language=language, timestamp=timestamp))
+            else:
+                f.write("<p>No analysis results available.</p>")
+            f.write(_HTML_REPORT_FOOTER)
             
+    def on_close(self):
+        """Flush pending history and close the window"""
+        self.flush_history()
+        self.root.destroy()
+        
     def __del__(self):
         """Cleanup database connection"""
         if hasattr(self, 'conn'):
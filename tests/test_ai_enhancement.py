@@ -0,0 +1,149 @@
+import os
+import re
+import tempfile
+import unittest
+
+import ai_enhancement
+from ai_enhancement import AIBugPredictor, HAVE_RE2
+
+
+def reference_predictions(predictor, code):
+    """Per-pattern finditer, the way the original scanner walked the patterns"""
+    hits = []
+    for vuln_type, patterns in predictor.vulnerability_patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern.pattern, code, re.IGNORECASE | re.MULTILINE):
+                line_num = code[:match.start()].count('\n') + 1
+                hits.append((vuln_type, line_num, match.group()))
+    return hits
+
+
+def summarize(findings):
+    return [(f.type, f.line, f.match) for f in findings]
+
+
+class PredictVulnerabilitiesTest(unittest.TestCase):
+    SAMPLES = [
+        'cursor.execute("%s" % a) cursor.execute("%s" % b)\n',
+        'query = "SELECT * FROM t WHERE id = " + user_id\n'
+        'cursor.execute("SELECT " + x)\n'
+        'el.innerHTML = "<b>" + name\n'
+        'password = "hunter2hunter2"\n'
+        'strcpy(dst, src); strcat(dst, src); sprintf(buf, fmt)\n'
+        'import threading\n'
+        'async def handler(): pass\n',
+        'no findings here\n',
+        # Quantifiers count characters: 5 characters, 10 UTF-8 bytes
+        'password = "\u00e9\u00e9\u00e9\u00e9\u00e9"\n'
+        'secret="\u00e9\u2026\u00e9\u2026\u00e9\u2026"  # caf\u00e9\n',
+    ]
+    
+    def setUp(self):
+        self.predictor = AIBugPredictor()
+    
+    def test_adjacent_matches_on_one_line(self):
+        code = self.SAMPLES[0]
+        findings = self.predictor.predict_vulnerabilities(code, 'python')
+        self.assertEqual(len(findings), 2)
+        self.assertEqual(summarize(findings), reference_predictions(self.predictor, code))
+    
+    def test_matches_reference(self):
+        for code in self.SAMPLES:
+            with self.subTest(code=code):
+                findings = self.predictor.predict_vulnerabilities(code, 'python')
+                self.assertEqual(summarize(findings), reference_predictions(self.predictor, code))
+    
+    def test_path_scan_matches_reference(self):
+        for code in self.SAMPLES:
+            with self.subTest(code=code):
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.py',
+                                                 delete=False) as f:
+                    f.write(code)
+                try:
+                    findings = self.predictor.predict_vulnerabilities_from_path(f.name, 'python')
+                finally:
+                    os.unlink(f.name)
+                self.assertEqual(summarize(findings), reference_predictions(self.predictor, code))
+    
+    def test_batch_matches_reference(self):
+        results = self.predictor.predict_vulnerabilities_batch(self.SAMPLES, 'python')
+        for code, findings in zip(self.SAMPLES, results):
+            with self.subTest(code=code):
+                self.assertEqual(summarize(findings), reference_predictions(self.predictor, code))
+    
+    def test_results_independent_of_call_order(self):
+        code = self.SAMPLES[1]
+        single_first = AIBugPredictor()
+        single = single_first.predict_vulnerabilities(code, 'python')
+        batch_after = single_first.predict_vulnerabilities_batch([code], 'python')[0]
+        
+        batch_first = AIBugPredictor()
+        batch = batch_first.predict_vulnerabilities_batch([code], 'python')[0]
+        single_after = batch_first.predict_vulnerabilities(code, 'python')
+        
+        self.assertEqual(single, single_after)
+        self.assertEqual(batch, batch_after)
+
+
+def reference_line_metrics(code):
+    """Line counts and nesting depth computed the straightforward way"""
+    lines = code.split('\n')
+    code_lines = [line for line in lines if line.strip() and not line.strip().startswith('#')]
+    comment_lines = [line for line in lines if line.strip().startswith('#')]
+    depths = [(len(line) - len(line.lstrip())) // 4 for line in code_lines]
+    return len(lines), len(code_lines), len(comment_lines), max(depths, default=0)
+
+
+class LineMetricsTest(unittest.TestCase):
+    SAMPLES = [
+        '',
+        '\n\n',
+        'def f():\n    # note\n    if x:\n\treturn 1\n\n  \x0c\n        y = 2',
+        'class A:\n    def m(self):\n        for i in x:\n            pass\n# end\n',
+        '   \r\n#\x1c\n\x1f  x\n',
+        'caf\u00e9 = 1\n    \u00e9t\u00e9 = 2  # non-ASCII\n',
+    ]
+    
+    def setUp(self):
+        self.predictor = AIBugPredictor()
+    
+    def test_python_loop_matches_reference(self):
+        for code in self.SAMPLES:
+            with self.subTest(code=code):
+                self.assertEqual(self.predictor._line_metrics(code), reference_line_metrics(code))
+    
+    def test_complexity_without_numpy(self):
+        # The fallback only runs when numpy is missing, so force that here
+        np = ai_enhancement.np
+        ai_enhancement.np = None
+        try:
+            for code in self.SAMPLES:
+                with self.subTest(code=code):
+                    metrics = AIBugPredictor().analyze_code_complexity(code)
+                    self.assertEqual(
+                        (metrics['total_lines'], metrics['code_lines'],
+                         metrics['comment_lines'], metrics['nesting_depth']),
+                        reference_line_metrics(code))
+        finally:
+            ai_enhancement.np = np
+    
+    @unittest.skipUnless(ai_enhancement.np is not None, 'numpy is not installed')
+    def test_vectorized_matches_python_loop(self):
+        for code in self.SAMPLES:
+            if code.isascii():
+                with self.subTest(code=code):
+                    self.assertEqual(self.predictor._line_metrics_vectorized(code),
+                                     self.predictor._line_metrics(code))
+
+
+@unittest.skipUnless(HAVE_RE2, 'google-re2 is not installed')
+class Re2PredictVulnerabilitiesTest(PredictVulnerabilitiesTest):
+    """Rerun the prediction checks with google-re2 as the regex engine"""
+    
+    def test_uses_re2(self):
+        self.assertEqual(ai_enhancement._re.__name__, 're2')
+        self.assertNotIsInstance(self.predictor._str_patterns[0][1], re.Pattern)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from enhanced_semgrep_rules import EnhancedSemgrepAnalyzer
+
+
+def fake_semgrep(cmd, **kwargs):
+    """Report one finding per target under the normalized path, as Semgrep does"""
+    targets = cmd[cmd.index('--jobs') + 2:]
+    results = [{'check_id': 'rule', 'path': os.path.normpath(path), 'start': {'line': 1}}
+               for path in targets]
+    return subprocess.CompletedProcess(cmd, 0, json.dumps({'results': results}).encode(), b'')
+
+
+class CustomRulesPathTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        os.mkdir('sub')
+        with open(os.path.join('sub', 'v.py'), 'w') as f:
+            f.write('eval(x)\n')
+        
+        self.analyzer = EnhancedSemgrepAnalyzer()
+        self.analyzer._rules_path = os.path.join(self._tmp.name, 'rules.yaml')
+        open(self.analyzer._rules_path, 'w').close()
+    
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def test_single_file_keeps_findings_for_rewritten_path(self):
+        with mock.patch('subprocess.run', fake_semgrep):
+            findings = self.analyzer.analyze_with_custom_rules('./sub/v.py')
+        self.assertEqual(len(findings), 1)
+    
+    def test_batch_groups_by_requested_path(self):
+        requested = ['./sub/v.py', os.path.join(self._tmp.name, 'sub') + '//v.py']
+        with mock.patch('subprocess.run', fake_semgrep):
+            findings = self.analyzer.analyze_files_with_custom_rules(requested)
+        self.assertEqual(sorted(findings), sorted(requested))
+        self.assertTrue(all(findings[path] for path in requested))
+
+
+if __name__ == '__main__':
+    unittest.main()
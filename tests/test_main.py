@@ -0,0 +1,320 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import unittest
+
+import main
+
+
+class FakeVar:
+    """Stand-in for a Tk variable, so the GUI can be exercised without a display"""
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+
+
+class FakeTree:
+    def __init__(self):
+        self.rows = []
+    
+    def get_children(self):
+        return tuple(range(len(self.rows)))
+    
+    def delete(self, *items):
+        self.rows = []
+    
+    def insert(self, parent, index, values):
+        self.rows.append(values)
+
+
+class FakeScrollbar:
+    def set(self, first, last):
+        pass
+
+
+class HistoryTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        
+        self.gui = main.ModernBugPredictionGUI.__new__(main.ModernBugPredictionGUI)
+        self.gui.selected_language = FakeVar('python')
+        self.gui.min_severity = FakeVar('INFO')
+        self.gui._ui_q = queue.Queue()
+        self.gui.setup_database()
+    
+    def tearDown(self):
+        self.gui.flush_history()
+        self.gui.conn.close()
+        del self.gui.conn
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def history_count(self, min_severity):
+        self.gui.min_severity.set(min_severity)
+        self.gui.cursor.execute(main._HISTORY_COUNT_SQL, (self.gui._history_min_rank(),))
+        return self.gui.cursor.fetchone()[0]
+    
+    def test_semgrep_only_row_ranked_by_findings(self):
+        vulnerabilities = [{'type': 'semgrep', 'severity': 'ERROR', 'line': 1}]
+        summary = self.gui.categorize_vulnerabilities(vulnerabilities)
+        row = self.gui._result_row('/src/a.py', summary, vulnerabilities)
+        self.assertEqual(row[-1], main.SEVERITY_RANKS['ERROR'])
+        
+        self.gui.save_analysis_result('/src/a.py', summary, vulnerabilities)
+        self.gui.flush_history()
+        self.assertEqual(self.history_count('WARNING'), 1)
+        self.assertEqual(self.history_count('ERROR'), 1)
+    
+    def test_clean_row_only_passes_info_filter(self):
+        summary = self.gui.categorize_vulnerabilities([])
+        self.gui.save_analysis_result('/src/b.py', summary, [])
+        self.gui.flush_history()
+        self.assertEqual(self.history_count('INFO'), 1)
+        self.assertEqual(self.history_count('WARNING'), 0)
+    
+    def test_migration_ranks_old_semgrep_only_rows(self):
+        self.gui.flush_history()
+        self.gui.conn.close()
+        os.remove('bug_analysis.db')
+        
+        old = sqlite3.connect('bug_analysis.db')
+        old.execute('''
+            CREATE TABLE analysis_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, filename TEXT,
+                language TEXT, total_vulnerabilities INTEGER, critical_count INTEGER,
+                high_count INTEGER, medium_count INTEGER, low_count INTEGER,
+                info_count INTEGER, results_json TEXT
+            )
+        ''')
+        rows = [
+            ('semgrep.py', 0, 0, json.dumps([{'severity': 'ERROR'}, {'severity': 'WARNING'}])),
+            ('high.py', 1, 1, json.dumps([{'severity': 'HIGH'}])),
+            ('clean.py', 0, 0, '[]'),
+        ]
+        old.executemany(
+            'INSERT INTO analysis_results (timestamp, filename, language, total_vulnerabilities, '
+            'critical_count, high_count, medium_count, low_count, info_count, results_json) '
+            'VALUES (\'2024-01-01T00:00:00\', ?, \'python\', ?, 0, ?, 0, 0, 0, ?)', rows)
+        old.commit()
+        old.close()
+        
+        self.gui.setup_database()
+        self.assertEqual(self.history_count('INFO'), 3)
+        self.assertEqual(self.history_count('WARNING'), 2)
+        self.assertEqual(self.history_count('ERROR'), 2)
+        self.assertEqual(self.history_count('CRITICAL'), 0)
+    
+    def test_refresh_reads_committed_rows_without_waiting(self):
+        self.gui.history_tree = FakeTree()
+        self.gui.history_scrollbar = FakeScrollbar()
+        self.gui._history_total = 0
+        self.gui._history_top = 0
+        self.gui._history_visible = 15
+        self.gui._history_pages = {}
+        
+        summary = self.gui.categorize_vulnerabilities([])
+        for name in ('a.py', 'b.py', 'c.py'):
+            self.gui.save_analysis_result(name, summary, [])
+        self.gui.flush_history()
+        
+        # The writer queues one refresh however many commits it made
+        callback, args = self.gui._ui_q.get_nowait()
+        self.assertTrue(self.gui._ui_q.empty())
+        
+        flush = self.gui.flush_history
+        self.gui.flush_history = lambda: self.fail('refresh_history waited on the writer')
+        try:
+            callback(*args)
+        finally:
+            self.gui.flush_history = flush
+        self.assertEqual(self.gui._history_total, 3)
+        self.assertEqual(len(self.gui.history_tree.rows), 3)
+    
+    def test_after_history_flush_runs_callback_once_committed(self):
+        summary = self.gui.categorize_vulnerabilities([])
+        self.gui.save_analysis_result('/src/c.py', summary, [])
+        
+        seen = []
+        self.gui.after_history_flush(lambda tag: seen.append((tag, self.history_count('INFO'))), 'done')
+        # Nothing runs on the calling thread; the continuation arrives via the UI queue
+        self.assertEqual(seen, [])
+        while not seen:
+            callback, args = self.gui._ui_q.get(timeout=5)
+            # Skip the writer's own history refresh
+            if args == ('done',):
+                callback(*args)
+        self.assertEqual(seen, [('done', 1)])
+
+
+class FakeSemgrep(main.SemgrepAnalyzer):
+    """SemgrepAnalyzer that records batches instead of starting semgrep
+    
+    Like Semgrep, it reports each path in normalized form; report_as can
+    override the reported path.
+    """
+    
+    def __init__(self, version, report_as=os.path.normpath):
+        super().__init__()
+        self.version = version
+        self.report_as = report_as
+        self.scanned = []
+    
+    def scan_batch(self, paths):
+        self.scanned.extend(paths)
+        return [{'path': self.report_as(path), 'check_id': 'rule', 'start': {'line': 1},
+                 'extra': {'severity': 'ERROR'}} for path in paths]
+
+
+class SemgrepCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        
+        self.paths = []
+        for name in ('same.py', 'same.js'):
+            with open(name, 'w') as f:
+                f.write('eval(x)\n')
+            self.paths.append(os.path.abspath(name))
+        
+        self.gui = main.ModernBugPredictionGUI.__new__(main.ModernBugPredictionGUI)
+        self.gui._ui_q = queue.Queue()
+        self.gui.analysis_status = FakeVar('')
+        self.gui.setup_database()
+    
+    def tearDown(self):
+        self.gui.flush_history()
+        self.gui.conn.close()
+        del self.gui.conn
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def scan(self, version, paths=None, report_as=os.path.normpath):
+        paths = self.paths if paths is None else paths
+        self.gui.semgrep_analyzer = FakeSemgrep(version, report_as)
+        self.findings = self.gui.run_semgrep_batches(paths, {path: main.read_and_hash(path)[0] for path in paths})
+        self.gui.flush_history()
+        self.assertEqual(sorted(self.findings), sorted(paths))
+        return sorted(self.gui.semgrep_analyzer.scanned)
+    
+    def test_reported_path_normalized_by_semgrep(self):
+        odd_path = self._tmp.name + '//same.py'
+        self.assertEqual(self.scan('1.0.0', [odd_path]), [odd_path])
+        self.assertEqual(len(self.findings[odd_path]), 1)
+        
+        self.assertEqual(self.scan('1.0.0', self.paths[:1]), [])
+        self.assertEqual(len(self.findings[self.paths[0]]), 1)
+    
+    def test_unmatched_report_not_cached_as_clean(self):
+        self.scan('1.0.0', self.paths[:1], report_as=lambda path: path + '.elsewhere')
+        self.assertEqual(self.findings[self.paths[0]], [])
+        self.assertEqual(self.scan('1.0.0', self.paths[:1]), self.paths[:1])
+        self.assertEqual(len(self.findings[self.paths[0]]), 1)
+    
+    def test_same_content_cached_per_extension(self):
+        self.assertEqual(self.scan('1.0.0'), sorted(self.paths))
+        self.assertEqual(self.scan('1.0.0'), [])
+    
+    def test_new_semgrep_version_misses_cache(self):
+        self.scan('1.0.0')
+        self.assertEqual(self.scan('1.1.0'), sorted(self.paths))
+    
+    def test_old_cache_table_is_replaced(self):
+        self.gui.conn.execute('DROP TABLE finding_cache')
+        self.gui.conn.execute(
+            'CREATE TABLE finding_cache (content_hash TEXT PRIMARY KEY, findings_blob BLOB)')
+        self.gui.conn.close()
+        self.gui.setup_database()
+        self.assertEqual(self.scan('1.0.0'), sorted(self.paths))
+
+
+
+class PatternScanReadTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        
+        self.paths = []
+        for name, data in (('crlf.py', b'x = 1\r\neval(input())\r\n'),
+                           ('bad.py', b'\xff\xfe os.system(cmd)\n')):
+            with open(name, 'wb') as f:
+                f.write(data)
+            self.paths.append(os.path.abspath(name))
+        
+        self.gui = main.ModernBugPredictionGUI.__new__(main.ModernBugPredictionGUI)
+        self.gui._ui_q = queue.Queue()
+        self.gui.setup_database()
+        self.gui.setup_patterns()
+    
+    def tearDown(self):
+        self.gui.flush_history()
+        self.gui.conn.close()
+        del self.gui.conn
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+    
+    def test_each_file_read_once(self):
+        expected = [self.gui._scanner.scan(path) for path in self.paths]
+        
+        reads = []
+        read_and_hash, read_source = main.read_and_hash, main.read_source
+        main.read_and_hash = lambda path: reads.append(path) or read_and_hash(path)
+        main.read_source = lambda path: self.fail(f'{path} was read twice')
+        try:
+            content_hashes = self.gui.hash_and_scan_files(self.paths)
+            self.gui.flush_history()
+            scanned = list(self.gui.scan_files_cached(self.paths, content_hashes))
+        finally:
+            main.read_and_hash, main.read_source = read_and_hash, read_source
+        
+        self.assertEqual(reads, self.paths)
+        self.assertEqual([findings for _, findings in scanned], expected)
+        for path in self.paths:
+            with open(path, 'rb') as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            self.assertEqual(content_hashes[path], digest)
+    
+    def test_read_and_hash_text_matches_read_source(self):
+        data = ('a\r\nb\rc\n\u00e9\u2026\r' * 50).encode('utf-8') + b'\xff\r\n\xe2\x82'
+        with open('mixed.py', 'wb') as f:
+            f.write(data)
+        
+        chunk, limit = main.READ_CHUNK_BYTES, main.MAX_SCAN_BYTES
+        try:
+            for main.READ_CHUNK_BYTES in (1, 2, 3, 7, 4096):
+                for main.MAX_SCAN_BYTES in (5, 64, 10000):
+                    with self.subTest(chunk=main.READ_CHUNK_BYTES, limit=main.MAX_SCAN_BYTES):
+                        digest, text = main.read_and_hash('mixed.py')
+                        self.assertEqual(text, main.read_source('mixed.py'))
+                        self.assertEqual(digest, hashlib.blake2b(data, digest_size=16).hexdigest())
+        finally:
+            main.READ_CHUNK_BYTES, main.MAX_SCAN_BYTES = chunk, limit
+    
+    @unittest.skipUnless((os.cpu_count() or 1) >= 2, 'needs two cores for worker processes')
+    def test_worker_processes_skip_cached_content(self):
+        self.gui.PARALLEL_SCAN_MIN_FILES = 1
+        self.gui.PARALLEL_SCAN_CHUNK = 1
+        
+        first = list(self.gui._hash_and_scan(self.paths))
+        self.assertTrue(all(findings is not None for _, _, findings in first))
+        self.gui.hash_and_scan_files(self.paths)
+        self.gui.flush_history()
+        
+        second = list(self.gui._hash_and_scan(self.paths))
+        self.assertEqual([digest for _, digest, _ in second], [digest for _, digest, _ in first])
+        self.assertTrue(all(findings is None for _, _, findings in second))
+
+if __name__ == '__main__':
+    unittest.main()